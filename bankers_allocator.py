@@ -0,0 +1,431 @@
+"""Stateful Banker's allocator with incremental safety re-checks.
+
+A safe sequence together with the Work vector seen before each step is a
+proof that the state is safe. Granting ``req`` to process ``p`` lowers Work
+by ``req`` for every step up to and including ``p`` and leaves every later
+step unchanged (``p`` returns the request when it finishes), so only the
+processes scheduled before ``p`` need to be re-validated. A release raises
+Work over the same prefix and can never break the proof. The full Safety
+algorithm only runs when the cached proof cannot be reused.
+
+Verdicts of full checks are also kept in a :class:`bankers_cache.SafetyCache`
+keyed by a fingerprint that is updated cell by cell, so probing a state that
+was seen before (such as a retried denied request) is a dictionary lookup
+plus an O(n*m) replay of the cached sequence. The replay checks every step,
+so a fingerprint collision costs a full check instead of a wrong verdict.
+"""
+import time
+
+from bankers_cache import (
+    ALLOCATION, AVAILABLE, MAXIMUM, SafetyCache, cell_hash, state_fingerprint,
+)
+from bankers_engine import (
+    DENIED, GRANTED, WAIT, BankersError, RequestResult, SafetyResult,
+    provisional_state, safety_check, validate_release, validate_request,
+)
+from bankers_metrics import COUNT_BUCKETS, REGISTRY
+
+_REQUESTS = REGISTRY.counter("bankers_requests_total", "Resource requests decided, by outcome.", ("status",))
+_REQUEST_SECONDS = REGISTRY.histogram("bankers_request_seconds", "Time to decide a resource request.",
+                                      labels=("status",))
+_CHECKS = REGISTRY.counter("bankers_checks_total", "Safety verdicts, by how they were reached.", ("path",))
+_SAFETY_SECONDS = REGISTRY.histogram("bankers_safety_seconds", "Duration of full Safety algorithm runs.")
+_SAFETY_STEPS = REGISTRY.histogram("bankers_safety_steps", "Processes finished per full Safety algorithm run.",
+                                   COUNT_BUCKETS)
+
+
+class _Proof:
+    # Safety check outcome plus the Work vector before each step
+    __slots__ = ("safe", "sequence", "works", "work", "position")
+
+    def __init__(self, safe, sequence, works, work):
+        self.safe = safe
+        self.sequence = sequence
+        self.works = works
+        self.work = work
+        self.position = {p: k for k, p in enumerate(sequence)}
+
+
+def _prove(state, on_step=None):
+    works = []
+
+    def record(p, before, after):
+        works.append(before)
+        if on_step:
+            on_step(p, before, after)
+
+    with REGISTRY.timer(_SAFETY_SECONDS):
+        result = safety_check(state, on_step=record)
+    if REGISTRY.enabled:
+        _SAFETY_STEPS.observe(len(result.sequence))
+    return _Proof(result.safe, result.sequence, works, result.work)
+
+
+def _replay(state, safe, sequence):
+    # Rebuilds a proof from a cached sequence in O(n*m), without searching.
+    # Returns None unless the sequence proves the verdict for this state: every
+    # step fits, and it covers every process (safe) or leaves none that could
+    # still run (unsafe). A mismatch means the fingerprint collided
+    n, m = state.n, state.m
+    work = state.available[:]
+    works = []
+    alloc, need = state.allocation, state.need
+    seen = set()
+    for p in sequence:
+        if not 0 <= p < n or p in seen:
+            return None
+        row = need[p]
+        for j in range(m):
+            if row[j] > work[j]:
+                return None
+        works.append(work[:])
+        row = alloc[p]
+        for j in range(m):
+            work[j] += row[j]
+        seen.add(p)
+    if safe != (len(seen) == n):
+        return None
+    if not safe:
+        for p in range(n):
+            if p not in seen and all(x <= w for x, w in zip(need[p], work)):
+                return None
+    return _Proof(safe, list(sequence), works, work)
+
+
+class BankersAllocator:
+    """Owns a :class:`bankers_engine.BankersState` and keeps it up to date.
+
+    The allocator mutates its own copy of the state in place; ``state`` is
+    always the current state and must not be modified by callers.
+    """
+
+    def __init__(self, state, cache_size=1024):
+        self.state = state.copy()
+        self.cache = SafetyCache(cache_size)
+        self._fingerprint = self._initial_fingerprint()
+        self._proof = None
+        self._free = set()
+        self.full_checks = 0
+        self.incremental_checks = 0
+
+    def load(self, state):
+        """Replaces the whole state, dropping the cached proof.
+
+        Cached verdicts are kept: they are keyed by the full state and stay
+        correct for whichever state they were computed on.
+        """
+        self.state = state.copy()
+        self._fingerprint = self._initial_fingerprint()
+        self._proof = None
+        self._free = set()
+
+    def _initial_fingerprint(self):
+        # Without a cache there is nothing to key, so skip hashing every cell
+        return state_fingerprint(self.state) if self.cache.capacity else None
+
+    def matches(self, state):
+        """Returns True if ``state`` holds the same matrices as the allocator."""
+        return (self.state.available == state.available
+                and self.state.allocation == state.allocation
+                and self.state.maximum == state.maximum)
+
+    def set_available(self, available):
+        """Overwrites the Available vector, e.g. after recomputing it from Total."""
+        available = list(available)
+        if len(available) != self.state.m:
+            raise BankersError(f"Available must have {self.state.m} resource values.")
+        if any(v < 0 for v in available):
+            raise BankersError("Available cannot be negative.")
+        h = self._fingerprint
+        if h is not None:
+            for j, (old, new) in enumerate(zip(self.state.available, available)):
+                if old != new:
+                    h ^= cell_hash(AVAILABLE, 0, j, old) ^ cell_hash(AVAILABLE, 0, j, new)
+            self._fingerprint = h
+        deltas = [(j, new - old) for j, (old, new) in enumerate(zip(self.state.available, available))
+                  if new != old]
+        self.state.available = available
+
+        # Changing Available shifts Work by the same amount at every step, so
+        # a safe proof survives as long as no step loses what it needs
+        proof = self._proof
+        if proof is None or not deltas:
+            return
+        need = self.state.need
+        if proof.safe and all(works[j] + d >= need[p][j]
+                              for p, works in zip(proof.sequence, proof.works)
+                              for j, d in deltas if d < 0):
+            for works in proof.works:
+                for j, d in deltas:
+                    works[j] += d
+            for j, d in deltas:
+                proof.work[j] += d
+        else:
+            self._proof = None
+
+    def _fingerprint_after(self, pid, delta, sign):
+        # Fingerprint of the state after moving sign * delta from Available to pid
+        h = self._fingerprint
+        if h is None:
+            return None
+        alloc = self.state.allocation[pid]
+        avail = self.state.available
+        for j, d in enumerate(delta):
+            if d:
+                a, v = alloc[j], avail[j]
+                h ^= cell_hash(ALLOCATION, pid, j, a) ^ cell_hash(ALLOCATION, pid, j, a + sign * d)
+                h ^= cell_hash(AVAILABLE, 0, j, v) ^ cell_hash(AVAILABLE, 0, j, v - sign * d)
+        return h
+
+    def _full_check(self, on_step=None):
+        cached = self.cache.get(self._fingerprint)
+        proof = None if cached is None else _replay(self.state, *cached)
+        if REGISTRY.enabled:
+            _CHECKS.inc("full" if proof is None else "cache")
+        if proof is not None:
+            self._proof = proof
+            return proof
+        self.full_checks += 1
+        self._proof = _prove(self.state, on_step)
+        self.cache.put(self._fingerprint, self._proof.safe, self._proof.sequence)
+        return self._proof
+
+    def check(self, on_step=None):
+        """Returns the :class:`SafetyResult` of the current state.
+
+        ``on_step`` is passed to the Safety algorithm if a full run is
+        needed; an exception raised from it aborts the check and leaves the
+        allocator unchanged.
+        """
+        proof = self._proof or self._full_check(on_step)
+        return SafetyResult(proof.safe, list(proof.sequence), proof.work[:])
+
+    def steps(self):
+        """Yields ``(pid, work_before, work_after)`` for the last safety check.
+
+        Replays the cached proof, so logging the steps of a state that was
+        reached incrementally needs no extra safety run.
+        """
+        proof = self._proof or self._full_check()
+        seq, works = proof.sequence, proof.works
+        for k, p in enumerate(seq):
+            after = works[k + 1] if k + 1 < len(seq) else proof.work
+            yield p, works[k], after
+
+    def _prefix_holds(self, proof, pid, req_vec):
+        # Can every process scheduled before pid still run with Work - req?
+        cols = [(j, r) for j, r in enumerate(req_vec) if r]
+        need = self.state.need
+        works = proof.works
+        for k in range(proof.position[pid]):
+            row = need[proof.sequence[k]]
+            w = works[k]
+            for j, r in cols:
+                if row[j] > w[j] - r:
+                    return False
+        return True
+
+    def _shift_prefix(self, proof, pid, delta, sign):
+        # Adds sign * delta to the Work vectors up to and including pid's step
+        cols = [(j, sign * d) for j, d in enumerate(delta) if d]
+        works = proof.works
+        for k in range(proof.position[pid] + 1):
+            w = works[k]
+            for j, d in cols:
+                w[j] += d
+
+    def _apply(self, pid, delta, sign):
+        self._fingerprint = self._fingerprint_after(pid, delta, sign)
+        state = self.state
+        alloc = state.allocation[pid]
+        need = state.need[pid]
+        avail = state.available
+        for j, d in enumerate(delta):
+            if d:
+                alloc[j] += sign * d
+                need[j] -= sign * d
+                avail[j] -= sign * d
+
+    def request(self, pid, req_vec, on_step=None):
+        """Runs the Resource-Request algorithm and applies the request if granted.
+
+        Returns a :class:`bankers_engine.RequestResult`; requests that exceed
+        Need raise :class:`bankers_engine.BankersError`. ``on_step`` is used
+        as in :meth:`check`.
+        """
+        if not REGISTRY.enabled:
+            return self._decide(pid, req_vec, on_step)
+        start = time.perf_counter()
+        try:
+            result = self._decide(pid, req_vec, on_step)
+        except BankersError:
+            _REQUESTS.inc("error")
+            raise
+        _REQUEST_SECONDS.observe(time.perf_counter() - start, result.status)
+        _REQUESTS.inc(result.status)
+        return result
+
+    def _decide(self, pid, req_vec, on_step):
+        state = self.state
+        req_vec = list(req_vec)
+        validate_request(state, pid, req_vec)
+
+        if any(r > a for r, a in zip(req_vec, state.available)):
+            return RequestResult(WAIT, None, state)
+
+        proof = self._proof
+        if proof is not None and not proof.safe:
+            # Granting anything from an unsafe state leaves it unsafe
+            return RequestResult(DENIED, None, state)
+
+        if proof is not None and self._prefix_holds(proof, pid, req_vec):
+            self.incremental_checks += 1
+            if REGISTRY.enabled:
+                _CHECKS.inc("incremental")
+            self._apply(pid, req_vec, 1)
+            self._shift_prefix(proof, pid, req_vec, -1)
+            return RequestResult(GRANTED, list(proof.sequence), state)
+
+        key = self._fingerprint_after(pid, req_vec, 1)
+        cached = self.cache.get(key)
+        provisional = provisional_state(state, pid, req_vec)
+        cached_proof = None if cached is None else _replay(provisional, *cached)
+        if REGISTRY.enabled:
+            _CHECKS.inc("full" if cached_proof is None else "cache")
+        if cached_proof is not None:
+            if not cached_proof.safe:
+                return RequestResult(DENIED, None, state)
+            self._apply(pid, req_vec, 1)
+            self._proof = cached_proof
+            return RequestResult(GRANTED, list(cached_proof.sequence), state)
+
+        self.full_checks += 1
+        new_proof = _prove(provisional, on_step)
+        self.cache.put(key, new_proof.safe, new_proof.sequence)
+        if not new_proof.safe:
+            return RequestResult(DENIED, None, state)
+        self._apply(pid, req_vec, 1)
+        self._proof = new_proof
+        return RequestResult(GRANTED, list(new_proof.sequence), state)
+
+    def release(self, pid, rel_vec):
+        """Returns ``rel_vec`` units held by ``pid`` to Available.
+
+        Max is unchanged, so the process's Need grows by the same amount.
+        """
+        rel_vec = list(rel_vec)
+        validate_release(self.state, pid, rel_vec)
+
+        self._apply(pid, rel_vec, -1)
+        proof = self._proof
+        if proof is not None:
+            if proof.safe:
+                self._shift_prefix(proof, pid, rel_vec, 1)
+            else:
+                # More Available may unblock the state; recheck lazily
+                self._proof = None
+
+    def allocate(self, pid, alloc_vec):
+        """Allocates ``alloc_vec`` to ``pid`` without the Banker's safety test.
+
+        Used to load allocations that already happened (e.g. when replaying
+        a trace); the result may be unsafe, which :meth:`check` reports.
+        """
+        state = self.state
+        alloc_vec = list(alloc_vec)
+        validate_request(state, pid, alloc_vec)
+        if any(r > a for r, a in zip(alloc_vec, state.available)):
+            raise BankersError("Allocation exceeds Available")
+
+        proof = self._proof
+        if proof is not None:
+            if proof.safe and self._prefix_holds(proof, pid, alloc_vec):
+                self._shift_prefix(proof, pid, alloc_vec, -1)
+            else:
+                self._proof = None
+        self._apply(pid, alloc_vec, 1)
+
+    def _set_max(self, pid, max_row):
+        state = self.state
+        old = state.maximum[pid]
+        h = self._fingerprint
+        if h is not None:
+            for j, (a, b) in enumerate(zip(old, max_row)):
+                if a != b:
+                    h ^= cell_hash(MAXIMUM, pid, j, a) ^ cell_hash(MAXIMUM, pid, j, b)
+            self._fingerprint = h
+        alloc = state.allocation[pid]
+        state.maximum[pid] = max_row
+        state.need[pid] = [x - a for x, a in zip(max_row, alloc)]
+
+    def add_process(self, max_row):
+        """Adds a process with the given Max and nothing allocated; returns its ID.
+
+        IDs of removed processes are reused, keeping the retired slot's step
+        when the new Need fits there. Otherwise the cached proof is extended
+        by scheduling the new process last, which holds whenever its Need
+        fits in the total of all resources.
+        """
+        state = self.state
+        max_row = list(max_row)
+        if len(max_row) != state.m:
+            raise BankersError(f"Max must have {state.m} resource values.")
+        if any(v < 0 for v in max_row):
+            raise BankersError("Max values cannot be negative.")
+
+        proof = self._proof
+        if self._free:
+            pid = self._free.pop()
+            k = proof.position.get(pid) if proof is not None else None
+            if k is None:
+                proof = self._proof = None
+            elif proof.safe and all(x <= w for x, w in zip(max_row, proof.works[k])):
+                # The slot holds nothing, so it can keep its step if it fits there
+                self._set_max(pid, max_row)
+                return pid
+            else:
+                # Dropping the empty slot's step changes no Work
+                del proof.position[pid]
+                del proof.sequence[k]
+                del proof.works[k]
+                for q in proof.sequence[k:]:
+                    proof.position[q] -= 1
+        else:
+            pid = state.n
+            state.allocation.append([0] * state.m)
+            state.maximum.append([0] * state.m)
+            state.need.append([0] * state.m)
+            state.n += 1
+            h = self._fingerprint
+            if h is not None:
+                for j in range(state.m):
+                    h ^= cell_hash(ALLOCATION, pid, j, 0) ^ cell_hash(MAXIMUM, pid, j, 0)
+                self._fingerprint = h
+        self._set_max(pid, max_row)
+
+        if proof is not None:
+            if proof.safe and all(x <= w for x, w in zip(max_row, proof.work)):
+                proof.position[pid] = len(proof.sequence)
+                proof.sequence.append(pid)
+                proof.works.append(proof.work[:])
+            else:
+                self._proof = None
+        return pid
+
+    def remove_process(self, pid):
+        """Releases everything ``pid`` holds and retires its ID for reuse.
+
+        The retired row keeps zero Allocation and Max, so it never affects
+        the safety of the others.
+        """
+        state = self.state
+        if pid < 0 or pid >= state.n or pid in self._free:
+            raise BankersError("Invalid Process ID")
+        held = state.allocation[pid]
+        if any(held):
+            self.release(pid, held[:])
+        # Lowering Need never breaks a safe proof but may fix an unsafe state
+        self._set_max(pid, [0] * state.m)
+        if self._proof is not None and not self._proof.safe:
+            self._proof = None
+        self._free.add(pid)
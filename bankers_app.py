@@ -0,0 +1,690 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+import random
+import sys
+from collections import deque
+
+from bankers_allocator import BankersAllocator
+from bankers_detect import DeadlockDetector
+from bankers_enum import SafeSequences
+from bankers_gantt import GanttChart
+from bankers_engine import (
+    GRANTED, WAIT, BankersError, BankersState, available_from_total,
+)
+from bankers_grid import MatrixGrid, ROW_H
+from bankers_log import TAGS, StepLog, filter_tag, render, step_record, text_record
+from bankers_metrics import REGISTRY
+from bankers_waitqueue import WaitQueue
+from bankers_worker import Worker
+
+# How often the Tk loop drains messages from the solver thread (ms)
+POLL_MS = 50
+# Log batches taken per drain, so a flood of records never stalls the UI
+POLL_BATCHES = 20
+# Lines kept in the log panel (the StepLog holds more) and records drawn per tick
+DISPLAY_LIMIT = 5000
+RENDER_CHUNK = 1000
+# Refresh interval of the stats window (ms)
+STATS_MS = 1000
+
+# GUI class implementing Banker's Algorithm with step-by-step visualization
+class BankersAlgoGUI:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Banker's Algorithm: Simulation")
+        self.root.geometry("1200x950")
+
+        # Matrix grids (created in setup_scrollable_area) and request inputs
+        self.matrix_grid = None
+        self.vector_grid = None
+        self.request_entries = []
+        self.entry_pid = None
+
+        # Allocator holding the last checked state and its safety proof
+        self.allocator = None
+        # Requests that had to wait, retried when resources are released
+        self.wait_queue = WaitQueue(0)
+        # Background thread for checks; its results come back through a queue
+        self.worker = Worker()
+        self.on_done = None
+        # Log records live in a ring buffer; the panel only renders the newest ones
+        self.step_log = StepLog()
+        self.render_queue = deque(maxlen=DISPLAY_LIMIT)
+        self.render_pending = False
+        # Timings and counters for the stats window; cheap enough to keep on in the GUI
+        REGISTRY.enabled = True
+        REGISTRY.gauge("bankers_waiting_requests", "Requests parked until a release lets them fit.",
+                       lambda: len(self.wait_queue))
+        self.stats_window = None
+        
+        # Validation command to allow only integer input
+        self.vcmd = (self.root.register(self.validate_input), '%P')
+
+        self.setup_ui()
+
+    def validate_input(self, new_value):
+        """Allow only digit input for Entry widgets."""
+        if new_value == "": return True
+        return new_value.isdigit()
+
+    # Main UI setup
+    def setup_ui(self):
+        # Top section for matrix size configuration
+        config_frame = tk.Frame(self.root, pady=10, bg="#f0f0f0")
+        config_frame.pack(fill="x")
+
+        # Number of processes input
+        tk.Label(config_frame, text="Processes (P):", bg="#f0f0f0").pack(side="left", padx=5)
+        self.entry_n = tk.Entry(config_frame, width=5, validate="key", validatecommand=self.vcmd)
+        self.entry_n.pack(side="left")
+        self.entry_n.insert(0, "5")
+
+        # Number of resources input
+        tk.Label(config_frame, text="Resources (R):", bg="#f0f0f0").pack(side="left", padx=5)
+        self.entry_m = tk.Entry(config_frame, width=5, validate="key", validatecommand=self.vcmd)
+        self.entry_m.pack(side="left")
+        self.entry_m.insert(0, "3")
+
+        # Buttons to generate/reset/load data
+        btn_gen = tk.Button(config_frame, text="Generate Table", command=self.generate_table, bg="#ddd")
+        btn_gen.pack(side="left", padx=15)
+        
+        btn_rand = tk.Button(config_frame, text="Random Data", command=self.fill_random_data, bg="#FFD700")
+        btn_rand.pack(side="right", padx=10)
+
+        btn_reset = tk.Button(config_frame, text="Reset Fields", command=self.reset_fields, bg="#ffcccb")
+        btn_reset.pack(side="right", padx=10)
+
+        btn_sample = tk.Button(config_frame, text="Load Sample Data", command=self.load_sample_data, bg="#ADD8E6")
+        btn_sample.pack(side="right", padx=10)
+
+        # Scrollable matrix area container
+        self.matrix_container = tk.Frame(self.root)
+        self.matrix_container.pack(pady=5, expand=True, fill="both")
+        self.setup_scrollable_area()
+
+        # Bottom operation section for safety check and request handling
+        ops_frame = tk.Frame(self.root, pady=5, relief="groove", bd=2)
+        ops_frame.pack(side="bottom", fill="x", padx=10, pady=5)
+
+        # Request input frame
+        self.req_frame = tk.Frame(ops_frame, pady=5)
+        self.req_frame.pack(fill="x")
+        
+        # Button to run safety algorithm
+        check_row = tk.Frame(ops_frame)
+        check_row.pack(pady=5)
+        btn_check = tk.Button(check_row, text="Check Safety & Show Steps", command=self.solve_and_log,
+                              bg="#4CAF50", fg="white", font=("Arial", 11, "bold"))
+        btn_check.pack(side="left", padx=5)
+
+        # Button to count and sample all safe sequences
+        btn_explore = tk.Button(check_row, text="Explore Safe Sequences", command=self.explore_sequences,
+                                bg="#ADD8E6", font=("Arial", 11))
+        btn_explore.pack(side="left", padx=5)
+
+        # Progress of a running check, with a way to stop it
+        progress_frame = tk.Frame(ops_frame)
+        progress_frame.pack(pady=2)
+        self.progress = ttk.Progressbar(progress_frame, length=300, mode="determinate")
+        self.progress.pack(side="left", padx=5)
+        self.btn_cancel = tk.Button(progress_frame, text="Cancel", command=self.worker.cancel,
+                                    state="disabled", bg="#ffcccb")
+        self.btn_cancel.pack(side="left")
+        
+        self.result_label = tk.Label(ops_frame, text="Status: Ready", font=("Arial", 12, "bold"))
+        self.result_label.pack(pady=2)
+
+        # Split area: logs & Gantt chart
+        bottom_split = tk.Frame(self.root, height=200)
+        bottom_split.pack(side="bottom", fill="both", padx=10, pady=10)
+
+        # Log window for detailed reasoning
+        log_frame = tk.LabelFrame(bottom_split, text="Step-by-Step Reasoning Log", font=("Arial", 10, "bold"))
+        log_frame.pack(side="left", fill="both", expand=True, padx=5)
+
+        # Tag filters and export for the log
+        log_tools = tk.Frame(log_frame)
+        log_tools.pack(side="top", fill="x")
+        self.log_filter = {}
+        for tag in TAGS:
+            var = tk.BooleanVar(value=True)
+            tk.Checkbutton(log_tools, text=tag.capitalize(), variable=var,
+                           command=self.refilter_log).pack(side="left")
+            self.log_filter[tag] = var
+        tk.Button(log_tools, text="Export...", command=self.export_log).pack(side="right", padx=2)
+        tk.Button(log_tools, text="Stats...", command=self.show_stats).pack(side="right", padx=2)
+        
+        self.log_text = tk.Text(log_frame, height=10, width=50, state="disabled", bg="#f9f9f9")
+        log_scroll = tk.Scrollbar(log_frame, command=self.log_text.yview)
+        self.log_text.configure(yscrollcommand=log_scroll.set)
+        self.log_text.pack(side="left", fill="both", expand=True)
+        log_scroll.pack(side="right", fill="y")
+        
+        # Log text color tags
+        self.log_text.tag_config("pass", foreground="green")
+        self.log_text.tag_config("fail", foreground="red")
+        self.log_text.tag_config("info", foreground="blue")
+
+        # Gantt chart area to visualize safe sequence
+        gantt_frame = tk.LabelFrame(bottom_split, text="Safe Sequence Gantt Chart", font=("Arial", 10, "bold"))
+        gantt_frame.pack(side="right", fill="both", expand=True, padx=5)
+        self.gantt = GanttChart(gantt_frame, height=150)
+        self.gantt.pack(fill="both", expand=True)
+
+    # Create the matrix area: virtualized grids draw only the visible cells
+    def setup_scrollable_area(self):
+        for w in self.matrix_container.winfo_children(): w.destroy()
+
+        self.matrix_grid = MatrixGrid(self.matrix_container, [
+            ("Allocation", "allocation", True),
+            ("Max", "max", True),
+            ("Need (Calc)", "need", False),
+        ], vcmd=self.vcmd)
+        self.matrix_grid.pack(side="top", expand=True, fill="both")
+
+        vector_frame = tk.Frame(self.matrix_container)
+        vector_frame.pack(side="top", fill="x", pady=5)
+        self.vector_grid = MatrixGrid(vector_frame, [
+            ("Total Resources", "total", True, "#e6f2ff"),
+            ("Available", "available", True),
+        ], vcmd=self.vcmd, row_label=lambda i: "", height=ROW_H)
+        self.vector_grid.pack(side="left", expand=True, fill="x")
+
+        btn_calc_avail = tk.Button(vector_frame, text="Calc Available", command=self.calculate_available,
+                                   bg="#ADD8E6", font=("Arial", 9, "bold"))
+        btn_calc_avail.pack(side="left", padx=10)
+
+    # Generate Allocation, Max, Need, Total, Available tables dynamically
+    def generate_table(self):
+        for widget in self.req_frame.winfo_children(): widget.destroy()
+        self.request_entries = []
+
+        # Get P and R counts
+        try:
+            n = int(self.entry_n.get())
+            m = int(self.entry_m.get())
+        except ValueError:
+            return
+        self.wait_queue = WaitQueue(m)
+
+        # Grids only hold values; cells are drawn as they scroll into view
+        self.matrix_grid.reset(n, m)
+        self.vector_grid.reset(1, m)
+
+        # Request row UI
+        tk.Label(self.req_frame, text="Make a Request:", font=("Arial", 10, "bold")).pack(side="left", padx=10)
+        tk.Label(self.req_frame, text="Process ID:").pack(side="left")
+        self.entry_pid = tk.Entry(self.req_frame, width=5, justify="center", validate="key", validatecommand=self.vcmd)
+        self.entry_pid.pack(side="left", padx=5)
+        tk.Label(self.req_frame, text="Request Vector:").pack(side="left", padx=5)
+        for j in range(m):
+            e = tk.Entry(self.req_frame, width=5, justify="center", validate="key", validatecommand=self.vcmd)
+            e.pack(side="left", padx=2)
+            self.request_entries.append(e)
+
+        btn_req = tk.Button(self.req_frame, text="Submit Request", command=self.handle_request,
+                            bg="#FF9800", fg="white")
+        btn_req.pack(side="left", padx=15)
+
+        btn_rel = tk.Button(self.req_frame, text="Release", command=self.handle_release,
+                            bg="#607D8B", fg="white")
+        btn_rel.pack(side="left")
+
+    # Compute Available = Total - Allocation sums
+    def calculate_available(self):
+        """Computes available resources from total and existing allocation."""
+        totals = self.vector_grid.matrix("total", blank=None)[0] if self.vector_grid.n else []
+        if None in totals:
+            messagebox.showerror("Error", "Please enter Total Resources first.")
+            return
+
+        alloc = self.matrix_grid.matrix("allocation")
+        avail = available_from_total(totals, alloc)
+
+        # Fill computed available vector
+        for j, avail_val in enumerate(avail):
+            if avail_val < 0:
+                messagebox.showwarning("Warning", f"Allocation for R{j} exceeds Total!")
+        self.vector_grid.set_row("available", 0, avail)
+
+    # Append messages to log panel
+    def write_log(self, message, tag=None):
+        self.add_records([text_record(message, tag)])
+
+    # Store records and queue the ones passing the tag filter for rendering
+    def add_records(self, records):
+        if not records: return
+        self.step_log.extend(records)
+        shown = self.shown_tags()
+        self.render_queue.extend(r for r in records if filter_tag(r) in shown)
+        self.schedule_render()
+
+    def shown_tags(self):
+        return {tag for tag, var in self.log_filter.items() if var.get()}
+
+    def schedule_render(self):
+        if not self.render_pending and self.render_queue:
+            self.render_pending = True
+            self.root.after_idle(self.render_log)
+
+    # Insert queued records in chunks, keeping at most DISPLAY_LIMIT lines
+    def render_log(self):
+        self.render_pending = False
+        args = []
+        for _ in range(min(RENDER_CHUNK, len(self.render_queue))):
+            for message, tag in render(self.render_queue.popleft()):
+                args.append(message + "\n")
+                args.append(tag or "")
+        if args:
+            self.log_text.config(state="normal")
+            self.log_text.insert(tk.END, *args)
+            lines = int(self.log_text.index("end-1c").split(".")[0])
+            if lines > DISPLAY_LIMIT:
+                self.log_text.delete("1.0", f"{lines - DISPLAY_LIMIT + 1}.0")
+            self.log_text.see(tk.END)
+            self.log_text.config(state="disabled")
+        if self.render_queue:
+            self.render_pending = True
+            self.root.after(1, self.render_log)
+
+    def clear_log(self):
+        self.step_log.clear()
+        self.render_queue.clear()
+        self.log_text.config(state="normal")
+        self.log_text.delete(1.0, tk.END)
+        self.log_text.config(state="disabled")
+
+    # Re-render the newest records that pass the tag filter
+    def refilter_log(self):
+        self.render_queue.clear()
+        self.log_text.config(state="normal")
+        self.log_text.delete(1.0, tk.END)
+        self.log_text.config(state="disabled")
+        self.render_queue.extend(self.step_log.tail(self.shown_tags(), DISPLAY_LIMIT))
+        self.schedule_render()
+
+    # Save the whole buffered trace, not just what the panel shows
+    def export_log(self):
+        path = filedialog.asksaveasfilename(defaultextension=".log",
+                                            filetypes=[("Log files", "*.log"), ("All files", "*.*")])
+        if not path: return
+        try:
+            count = self.step_log.export(path)
+        except OSError as exc:
+            messagebox.showerror("Error", str(exc))
+            return
+        messagebox.showinfo("Export", f"Wrote {count} log records to {path}.")
+
+    # Live timings and counters, refreshed while the window is open
+    def show_stats(self):
+        if self.stats_window is not None and self.stats_window.winfo_exists():
+            self.stats_window.lift()
+            return
+        win = tk.Toplevel(self.root)
+        win.title("Allocator Stats")
+        text = tk.Text(win, width=110, height=24, state="disabled", bg="#f9f9f9", font=("Courier", 9))
+        text.pack(side="top", fill="both", expand=True)
+        buttons = tk.Frame(win)
+        buttons.pack(side="bottom", fill="x")
+        tk.Button(buttons, text="Reset", command=REGISTRY.reset).pack(side="left", padx=5, pady=2)
+        tk.Button(buttons, text="Export Prometheus...", command=self.export_stats).pack(side="left", pady=2)
+        self.stats_window = win
+        self.refresh_stats(text)
+
+    def refresh_stats(self, text):
+        if not text.winfo_exists(): return
+        lines = REGISTRY.summary() or ["No measurements yet."]
+        text.config(state="normal")
+        text.delete("1.0", tk.END)
+        text.insert(tk.END, "\n".join(lines))
+        text.config(state="disabled")
+        self.root.after(STATS_MS, lambda: self.refresh_stats(text))
+
+    def export_stats(self):
+        path = filedialog.asksaveasfilename(defaultextension=".prom",
+                                            filetypes=[("Prometheus text", "*.prom"), ("All files", "*.*")])
+        if not path: return
+        try:
+            with open(path, "w") as f:
+                f.write(REGISTRY.render())
+        except OSError as exc:
+            messagebox.showerror("Error", str(exc))
+
+    # Run job(progress) on the worker thread; on_done(value) runs back on the Tk thread
+    def run_in_background(self, job, on_done, total=0):
+        self.on_done = on_done
+        self.worker.start(job, total)
+        self.progress.config(maximum=max(total, 1), value=0)
+        self.btn_cancel.config(state="normal")
+        self.root.after(POLL_MS, self.poll_worker)
+
+    # Drain worker messages in batches from the Tk event loop
+    def poll_worker(self):
+        records = []
+        finished = None
+        for message in self.worker.poll(POLL_BATCHES):
+            kind = message[0]
+            if kind == "log":
+                records.extend(message[1])
+            elif kind == "progress":
+                self.progress.config(value=message[1])
+            else:
+                finished = message
+        self.add_records(records)
+        if finished is None:
+            self.root.after(POLL_MS, self.poll_worker)
+            return
+
+        self.btn_cancel.config(state="disabled")
+        self.progress.config(value=0)
+        kind, value = finished
+        if kind == "done":
+            self.on_done(value)
+        elif kind == "cancelled":
+            self.write_log("Cancelled.", "fail")
+            self.result_label.config(text="Status: Cancelled", fg="black")
+        else:
+            self.write_log(f"Error: {value}", "fail")
+            messagebox.showerror("Error", str(value))
+
+    # Main safety algorithm and logging
+    def solve_and_log(self, clear_log=True):
+        """Runs Banker's Safety algorithm in the background and logs steps."""
+        if self.worker.busy: return
+        if clear_log:
+            self.clear_log()
+        
+        allocator = self.sync_allocator()
+        if not allocator: return
+        state = allocator.state
+
+        # Update Need matrix UI
+        self.matrix_grid.set_matrix("need", state.need)
+
+        self.write_log("--- Starting Safety Algorithm ---", "info")
+        self.write_log(f"Initial Available: {state.available}\n")
+        self.result_label.config(text="Checking...", fg="black")
+
+        # Safety algorithm core (reuses the allocator's proof when still valid)
+        def job(progress):
+            result = allocator.check(on_step=progress.on_step)
+            for p, work_before, work_after in allocator.steps():
+                # Copies, since the allocator updates its rows and proof in place
+                progress.log(step_record(p, state.need[p][:], work_before[:], work_after[:]))
+            report = [] if result.safe else self.deadlock_report(state, progress)
+            return result, report
+
+        self.run_in_background(job, lambda done: self.show_safety_result(*done), total=state.n)
+
+    # Deadlock detection for an unsafe state; runs inside the background job
+    def deadlock_report(self, state, progress):
+        requests = {}
+        for waiter in self.wait_queue.waiters():
+            if waiter.pid < state.n and len(waiter.vector) == state.m:
+                row = requests.setdefault(waiter.pid, [0] * state.m)
+                for j, v in enumerate(waiter.vector):
+                    row[j] += v
+        report = [text_record("\n--- Deadlock Detection (waiting requests) ---", "info")]
+        if not requests:
+            # Unsafe on Max claims alone does not mean anything is deadlocked now
+            report.append(text_record("No outstanding requests, so no process is deadlocked yet.", "pass"))
+            return report
+        detector = DeadlockDetector.from_state(state, requests)
+        dead = detector.deadlocked
+        if not dead:
+            report.append(text_record("No process is deadlocked on its current requests.", "pass"))
+            return report
+        report.append(text_record(f"Deadlocked: {[f'P{p}' for p in dead]}", "fail"))
+        victims = detector.victims(on_candidate=progress.check)
+        kind = "minimum-cost" if victims.exact else "suggested"
+        report.append(text_record(f"Abort ({kind}, cost {victims.cost}): "
+                                  f"{[f'P{p}' for p in victims.pids]}", "info"))
+        return report
+
+    def show_safety_result(self, result, report=()):
+        safe_seq = [f"P{p}" for p in result.sequence]
+        
+        # Final result handling
+        if result.safe:
+            self.result_label.config(text=f"SAFE STATE. Sequence: {' -> '.join(safe_seq)}", fg="green")
+            self.write_log(f"\nSystem is SAFE. Sequence: {safe_seq}", "pass")
+            self.draw_gantt_chart(result.sequence)
+        else:
+            self.write_log(f"\nNo process can be satisfied with Work {result.work}.", "fail")
+            self.result_label.config(text="UNSAFE (Deadlock Detected)", fg="red")
+            self.write_log(f"\nSystem is UNSAFE. Deadlock detected.", "fail")
+            self.gantt.clear()
+            self.add_records(list(report))
+
+    # Count safe sequences, then show a min-peak and a random one
+    def explore_sequences(self):
+        if self.worker.busy: return
+        allocator = self.sync_allocator()
+        if not allocator: return
+        state = allocator.state.copy()
+
+        self.clear_log()
+        self.write_log("--- Exploring Safe Sequences ---", "info")
+        self.result_label.config(text="Exploring...", fg="black")
+
+        def job(progress):
+            # progress.check raises Cancelled once Cancel is pressed
+            space = SafeSequences(state, on_state=progress.check)
+            if not space.safe:
+                return space, None, None
+            return space, space.min_peak(), space.sample()
+
+        self.run_in_background(job, lambda done: self.show_sequences(*done))
+
+    def show_sequences(self, space, best, sample):
+        if not space.safe:
+            self.write_log("System is UNSAFE: there are no safe sequences.", "fail")
+            self.result_label.config(text="UNSAFE: no safe sequences", fg="red")
+            return
+        groups = sum(1 for c in space.classes if len(c) > 1)
+        self.write_log(f"Safe sequences: {space.count} "
+                       f"({space.states} states explored, {groups} groups of identical processes)", "pass")
+        peak, sequence = best
+        self.write_log(f"Lowest peak usage ({peak} units held): {[f'P{p}' for p in sequence]}", "info")
+        self.write_log(f"Random safe sequence: {[f'P{p}' for p in sample]}")
+        self.result_label.config(text=f"{space.count} safe sequences", fg="green")
+        self.draw_gantt_chart(sequence)
+
+    # Extract state from UI into a BankersState
+    def get_state_from_ui(self):
+        alloc = self.matrix_grid.matrix("allocation")
+        max_mat = self.matrix_grid.matrix("max")
+        avail = self.vector_grid.matrix("available")[0] if self.vector_grid.n else []
+        try:
+            return BankersState(alloc, max_mat, avail)
+        except BankersError as exc:
+            messagebox.showerror("Error", str(exc))
+            return None
+
+    # Reuse the allocator while the UI still shows its state
+    def sync_allocator(self):
+        state = self.get_state_from_ui()
+        if not state: return None
+        if self.allocator is None:
+            self.allocator = BankersAllocator(state)
+        elif not self.allocator.matches(state):
+            self.allocator.load(state)
+        return self.allocator
+
+    # Handle resource request from a process
+    def handle_request(self):
+        if self.worker.busy: return
+        try:
+            pid = int(self.entry_pid.get())
+            req_vec = [int(e.get() if e.get() else 0) for e in self.request_entries]
+        except ValueError:
+            messagebox.showerror("Error", "Invalid Request Inputs")
+            return
+
+        allocator = self.sync_allocator()
+        if not allocator: return
+
+        # Logging the request
+        self.clear_log()
+        self.write_log(f"--- Handling Request for P{pid}: {req_vec} ---", "info")
+
+        # Resource-Request algorithm (need, available and safety checks)
+        def job(progress):
+            return allocator.request(pid, req_vec, on_step=progress.on_step)
+
+        self.run_in_background(job, lambda result: self.show_request_result(pid, req_vec, result),
+                               total=allocator.state.n)
+
+    def show_request_result(self, pid, req_vec, result):
+        state = self.allocator.state
+        if result.status == WAIT:
+            self.write_log(f"Wait: Request {req_vec} > Available {state.available}", "fail")
+            self.wait_queue.add(pid, req_vec, state.available)
+            self.write_log(f"P{pid} queued; it is retried when resources are released.", "info")
+            messagebox.showwarning("Wait", f"Resources not available. P{pid} must wait.")
+            return
+
+        self.write_log("Conditions met. Attempting provisional allocation...", "info")
+        
+        # Grant or deny request
+        if result.status == GRANTED:
+            safe_seq = [f"P{p}" for p in result.sequence]
+            self.write_log(f"Request Granted. Safe Sequence: {safe_seq}", "pass")
+            self.result_label.config(text="Request GRANTED", fg="green")
+            self.draw_gantt_chart(result.sequence)
+            
+            # Update UI to new state
+            self.write_back_row(pid)
+            
+            # Show the new state's steps; the allocator already holds its proof
+            self.solve_and_log()
+        else:
+            self.write_log("Request Denied. Resulting state would be UNSAFE.", "fail")
+            self.result_label.config(text="Request DENIED", fg="red")
+            messagebox.showwarning("Unsafe", "Request Denied.\nSystem would enter Unsafe state.")
+
+    # Release resources held by a process and wake waiting requests
+    def handle_release(self):
+        if self.worker.busy: return
+        try:
+            pid = int(self.entry_pid.get())
+            rel_vec = [int(e.get() if e.get() else 0) for e in self.request_entries]
+        except ValueError:
+            messagebox.showerror("Error", "Invalid Request Inputs")
+            return
+
+        allocator = self.sync_allocator()
+        if not allocator: return
+        state = allocator.state
+        wait_queue = self.wait_queue
+
+        self.clear_log()
+        self.write_log(f"--- Releasing {rel_vec} from P{pid} ---", "info")
+
+        # Woken requests may need full safety checks, so this runs in the background too;
+        # returns the processes whose rows changed
+        def job(progress):
+            allocator.release(pid, rel_vec)
+            changed = [pid]
+            progress.log(text_record(f"New Available: {state.available}"))
+
+            # Only requests that now fit in Available are re-evaluated
+            for waiter in wait_queue.on_release(rel_vec, state.available):
+                try:
+                    result = allocator.request(waiter.pid, waiter.vector)
+                except BankersError as exc:
+                    progress.log(text_record(f"Dropped waiting request of P{waiter.pid}: {exc}", "fail"))
+                    continue
+                if result.status == WAIT:
+                    wait_queue.requeue(waiter, state.available)
+                elif result.status == GRANTED:
+                    progress.log(text_record(f"Waiting request of P{waiter.pid} {waiter.vector} GRANTED.", "pass"))
+                    changed.append(waiter.pid)
+                else:
+                    progress.log(text_record(f"Waiting request of P{waiter.pid} {waiter.vector} DENIED (unsafe).", "fail"))
+            if len(wait_queue):
+                progress.log(text_record(f"{len(wait_queue)} request(s) still waiting.", "info"))
+            progress.log(text_record(""))
+            return changed
+
+        self.run_in_background(job, self.show_release_result)
+
+    def show_release_result(self, changed):
+        for pid in changed:
+            self.write_back_row(pid)
+        self.solve_and_log(clear_log=False)
+
+    # Copy a process's Allocation row and the Available vector back to the UI
+    def write_back_row(self, pid):
+        state = self.allocator.state
+        self.vector_grid.set_row("available", 0, state.available)
+        self.matrix_grid.set_row("allocation", pid, state.allocation[pid])
+
+    # Draw graphical safe sequence (Gantt chart)
+    def draw_gantt_chart(self, sequence):
+        self.gantt.set_sequence(sequence)
+
+    # Fill matrices with valid random data
+    def fill_random_data(self):
+        self.generate_table()
+        try:
+            n = int(self.entry_n.get())
+            m = int(self.entry_m.get())
+            
+            alloc_sums = [0] * m
+            max_mat, alloc = [], []
+            
+            # Random allocation and max values
+            for i in range(n):
+                max_row = [random.randint(1, 15) for _ in range(m)]
+                alloc_row = [random.randint(0, v) for v in max_row]
+                max_mat.append(max_row)
+                alloc.append(alloc_row)
+                for j in range(m):
+                    alloc_sums[j] += alloc_row[j]
+            self.matrix_grid.set_matrix("max", max_mat)
+            self.matrix_grid.set_matrix("allocation", alloc)
+            
+            # Available and Total (consistent)
+            avail = [random.randint(1, 10) for _ in range(m)]
+            self.vector_grid.set_row("available", 0, avail)
+            self.vector_grid.set_row("total", 0, [s + a for s, a in zip(alloc_sums, avail)])
+                
+        except ValueError: pass
+
+    # Load predefined sample data (from popular OS textbook example)
+    def load_sample_data(self):
+        self.entry_n.delete(0, tk.END); self.entry_n.insert(0, "5")
+        self.entry_m.delete(0, tk.END); self.entry_m.insert(0, "3")
+        self.generate_table()
+        alloc_data = [[0,1,0], [2,0,0], [3,0,2], [2,1,1], [0,0,2]]
+        max_data   = [[7,5,3], [3,2,2], [9,0,2], [2,2,2], [4,3,3]]
+        avail_data = [3, 3, 2]
+        
+        totals = [10, 5, 7]  # Pre-computed totals for sample
+
+        # Fill sample matrices
+        self.matrix_grid.set_matrix("allocation", alloc_data)
+        self.matrix_grid.set_matrix("max", max_data)
+        self.vector_grid.set_row("available", 0, avail_data)
+        self.vector_grid.set_row("total", 0, totals)
+            
+    def reset_fields(self):
+        """Clears the table by regenerating it."""
+        self.generate_table()
+
+# Main application run
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        print(f"Error: cannot open the GUI: {exc}", file=sys.stderr)
+        return 1
+    BankersAlgoGUI(root)
+    root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""Command-line batch evaluation of many scenarios on all cores.
+
+Reads scenarios as JSON lines, one state per line::
+
+    {"id": "snap-1", "allocation": [[0, 1]], "max": [[1, 1]], "available": [1, 0],
+     "requests": [{"pid": 0, "vector": [1, 0]}]}
+
+``id`` and ``requests`` are optional; requests are applied in order, each
+on the state left by the previous grants. Rows may also be sparse
+``{"resource": value}`` objects; scenarios that are mostly zeros are
+evaluated with the sparse engine (:mod:`bankers_sparse`). Lines are sharded in chunks
+across a process pool and one JSON result per scenario is streamed to the
+output, in input order::
+
+    python bankers_batch.py scenarios.jsonl -o results.jsonl --workers 8
+
+Binary ``.bks`` files (see :mod:`bankers_format`) are sharded by byte
+offset instead: every worker maps the file itself, so scenario data is
+never pickled between processes. Their results carry the scenario
+``index`` in place of an ``id``.
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bankers_sparse
+from bankers_allocator import BankersAllocator
+from bankers_engine import BankersError, safety_check, to_int
+from bankers_format import open_binary
+from bankers_sparse import SparseState, load_state
+
+CHUNK_SIZE = 256
+
+
+def evaluate_scenario(data):
+    """Runs the Safety and Request algorithms on one scenario dict.
+
+    Returns a result dict with ``safe``, ``sequence``, the request
+    ``statuses`` if any, and ``seconds`` spent; invalid scenarios yield an
+    ``error`` entry instead of raising.
+    """
+    start = time.perf_counter()
+    result = {}
+    if "id" in data:
+        result["id"] = data["id"]
+    try:
+        state = load_state(data)
+        if isinstance(state, SparseState):
+            statuses = _evaluate_sparse(state, data.get("requests", ()), result)
+        else:
+            allocator = BankersAllocator(state, cache_size=0)
+            check = allocator.check()
+            result["safe"] = check.safe
+            result["sequence"] = check.sequence if check.safe else None
+            statuses = []
+            for req in data.get("requests", ()):
+                try:
+                    statuses.append(allocator.request(to_int(req["pid"]), [to_int(v) for v in req["vector"]]).status)
+                except Exception as exc:
+                    statuses.append(f"error: {exc}")
+        if statuses:
+            result["statuses"] = statuses
+    except Exception as exc:
+        # Any bad value (1e400 as a count, ...) fails this scenario only, not the chunk
+        result["error"] = str(exc)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _evaluate_sparse(state, requests, result):
+    check = bankers_sparse.safety_check(state)
+    result["safe"] = check.safe
+    result["sequence"] = check.sequence if check.safe else None
+    statuses = []
+    for req in requests:
+        try:
+            outcome = bankers_sparse.request(state, to_int(req["pid"]), req["vector"])
+        except Exception as exc:
+            statuses.append(f"error: {exc}")
+            continue
+        state = outcome.state
+        statuses.append(outcome.status)
+    return statuses
+
+
+def evaluate_lines(lines):
+    """Worker entry point: evaluates a chunk of JSON lines, returns JSON lines."""
+    out = []
+    for line in lines:
+        try:
+            data = json.loads(line)
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as exc:
+            out.append(json.dumps({"error": f"Bad JSON: {exc}"}))
+            continue
+        out.append(json.dumps(evaluate_scenario(data)))
+    return out
+
+
+# Mapped binary inputs, kept open for the lifetime of each worker process
+_open_files = {}
+
+
+def evaluate_binary(task):
+    """Worker entry point: evaluates ``(path, [(index, offset), ...])`` of a .bks file."""
+    path, entries = task
+    scenarios = _open_files.get(path)
+    if scenarios is None:
+        scenarios = _open_files[path] = open_binary(path)
+    out = []
+    for index, offset in entries:
+        start = time.perf_counter()
+        result = {"index": index}
+        try:
+            check = safety_check(scenarios.view_at(offset, index).to_state())
+            result["safe"] = check.safe
+            result["sequence"] = check.sequence if check.safe else None
+        except Exception as exc:
+            # As in evaluate_scenario: one bad record must not end the run
+            result["error"] = str(exc)
+        result["seconds"] = time.perf_counter() - start
+        out.append(json.dumps(result))
+    return out
+
+
+def _binary_tasks(path, size):
+    # Only record headers are read here; workers read the matrices
+    with open_binary(path) as scenarios:
+        for chunk in _chunks(((v.index, v.offset) for v in scenarios), size):
+            yield path, chunk
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(chunks, evaluate, out, workers=None):
+    """Evaluates ``chunks`` with ``evaluate`` in a process pool, writing results in order.
+
+    At most two chunks per worker are in flight, so inputs of any size are
+    streamed in bounded memory. ``workers=1`` evaluates in this process.
+    Returns the number of result lines written.
+    """
+    workers = workers or os.cpu_count() or 1
+    written = 0
+    if workers == 1:
+        for chunk in chunks:
+            for line in evaluate(chunk):
+                out.write(line + "\n")
+                written += 1
+        return written
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = collections.deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(evaluate, chunk))
+            if len(in_flight) >= 2 * workers:
+                for line in in_flight.popleft().result():
+                    out.write(line + "\n")
+                    written += 1
+        while in_flight:
+            for line in in_flight.popleft().result():
+                out.write(line + "\n")
+                written += 1
+    return written
+
+
+def _input_lines(path):
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        for line in f:
+            if line.strip():
+                yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate Banker's Algorithm scenarios in parallel")
+    parser.add_argument("input", help="JSON-lines or binary .bks scenario file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="result file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="scenarios per task")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    start = time.perf_counter()
+    try:
+        if args.input.endswith(".bks"):
+            chunks, evaluate = _binary_tasks(args.input, args.chunk_size), evaluate_binary
+        else:
+            chunks, evaluate = _chunks(_input_lines(args.input), args.chunk_size), evaluate_lines
+        count = run_batch(chunks, evaluate, out, args.workers)
+    except (OSError, BankersError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {count} scenarios in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""Benchmarks for the Safety and Resource-Request algorithms.
+
+Seeded generators build states of a given shape:
+
+* ``safe``        random claims with just enough Available for a random order
+* ``unsafe``      the same, except the last process claims more than exists
+* ``adversarial`` a chain where only the last process can run, then the one
+                  before it, and so on: the worst case for index-order scans
+* ``sparse``      each process claims only a few resource types
+
+Each engine variant is timed on every (generator, n, m) point of the sweep;
+latency percentiles, throughput and peak traced memory are reported as JSON
+lines for regression comparison::
+
+    python bankers_bench.py --n 10,1000,100000 --m 1,10,1000 -o run.jsonl
+    python bankers_bench.py ... --compare run.jsonl     # exit 1 on regression
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import bankers_engine
+from bankers_allocator import BankersAllocator
+from bankers_engine import BankersState
+
+GENERATORS = ("safe", "unsafe", "adversarial", "sparse")
+
+
+def _min_available(alloc, need, order, m):
+    # Smallest Available for which ``order`` is a safe sequence
+    avail = [0] * m
+    held = [0] * m
+    for p in order:
+        for j in range(m):
+            short = need[p][j] - held[j]
+            if short > avail[j]:
+                avail[j] = short
+            held[j] += alloc[p][j]
+    return avail
+
+
+def _safe_parts(n, m, rng, high):
+    maximum = [[rng.randint(0, high) for _ in range(m)] for _ in range(n)]
+    alloc = [[rng.randint(0, v) for v in row] for row in maximum]
+    need = [[x - a for x, a in zip(mrow, arow)] for mrow, arow in zip(maximum, alloc)]
+    order = list(range(n))
+    rng.shuffle(order)
+    return alloc, maximum, _min_available(alloc, need, order, m), order
+
+
+def gen_safe(n, m, rng, high=20):
+    """Random Max/Allocation; Available is the minimum that keeps some order safe."""
+    alloc, maximum, avail, _ = _safe_parts(n, m, rng, high)
+    return BankersState(alloc, maximum, avail)
+
+
+def gen_unsafe(n, m, rng, high=20):
+    """A :func:`gen_safe` state whose last process claims more than exists.
+
+    Every other process can still finish, so a safety check has to get
+    through almost all of them before it can report the state unsafe.
+    """
+    alloc, maximum, avail, order = _safe_parts(n, m, rng, high)
+    if n:
+        last, j = order[-1], rng.randrange(m)
+        total = avail[j] + sum(row[j] for row in alloc)
+        maximum[last][j] = alloc[last][j] + total + 1
+    return BankersState(alloc, maximum, avail)
+
+
+def gen_adversarial(n, m, rng, high=3):
+    """Only P(n-1) can run at first; each finishing process unblocks only its predecessor."""
+    alloc = [[rng.randint(1, high) for _ in range(m)] for _ in range(n)]
+    maximum = [None] * n
+    work = [rng.randint(0, high) for _ in range(m)]
+    avail = work[:]
+    for p in range(n - 1, -1, -1):
+        # Needs exactly what is free when its turn comes, and nothing earlier fits
+        maximum[p] = [w + a for w, a in zip(work, alloc[p])]
+        work = [w + a for w, a in zip(work, alloc[p])]
+    return BankersState(alloc, maximum, avail)
+
+
+def gen_sparse(n, m, rng, per_process=3, high=20):
+    """Each process claims at most ``per_process`` resource types."""
+    maximum = [[0] * m for _ in range(n)]
+    alloc = [[0] * m for _ in range(n)]
+    for p in range(n):
+        for j in rng.sample(range(m), min(per_process, m)):
+            maximum[p][j] = rng.randint(1, high)
+            alloc[p][j] = rng.randint(0, maximum[p][j])
+    need = [[x - a for x, a in zip(mrow, arow)] for mrow, arow in zip(maximum, alloc)]
+    order = list(range(n))
+    rng.shuffle(order)
+    return BankersState(alloc, maximum, _min_available(alloc, need, order, m))
+
+
+def generate(kind, n, m, seed):
+    """Builds a state with the named generator and a fixed seed."""
+    rng = random.Random(f"{kind}-{n}-{m}-{seed}")
+    return {"safe": gen_safe, "unsafe": gen_unsafe,
+            "adversarial": gen_adversarial, "sparse": gen_sparse}[kind](n, m, rng)
+
+
+def naive_safety(state):
+    """The textbook Safety algorithm: rescan every unfinished process per pass."""
+    n, m = state.n, state.m
+    need, alloc = state.need, state.allocation
+    work = state.available[:]
+    finish = [False] * n
+    count = 0
+    while count < n:
+        found = False
+        for p in range(n):
+            if not finish[p] and all(need[p][j] <= work[j] for j in range(m)):
+                for k in range(m):
+                    work[k] += alloc[p][k]
+                finish[p] = True
+                found = True
+                count += 1
+        if not found:
+            break
+    return count == n
+
+
+def _request_probes(state, rng, count):
+    # Small valid requests from random processes
+    probes = []
+    for _ in range(count):
+        pid = rng.randrange(state.n)
+        probes.append((pid, [min(x, a, 1) for x, a in zip(state.need[pid], state.available)]))
+    return probes
+
+
+class Variant:
+    """One engine variant: ``prepare(state)`` returns a zero-argument callable to time."""
+
+    def __init__(self, name, prepare, fits=None):
+        self.name = name
+        self.prepare = prepare
+        self.fits = fits
+
+    def applies(self, n, m):
+        return self.fits is None or self.fits(n, m)
+
+
+def _variants():
+    variants = [
+        Variant("naive-safety", lambda s: lambda: naive_safety(s),
+                fits=lambda n, m: n * n * m <= 5 * 10 ** 8),
+        Variant("engine-safety", lambda s: lambda: bankers_engine.safety_check(s)),
+    ]
+
+    def engine_requests(state):
+        rng = random.Random(0)
+        probes = _request_probes(state, rng, 16)
+        return lambda: [bankers_engine.request(state, pid, vec) for pid, vec in probes]
+
+    def allocator_requests(state):
+        allocator = BankersAllocator(state)
+        allocator.check()
+        rng = random.Random(0)
+        probes = _request_probes(state, rng, 16)
+
+        def run():
+            # Grant then release, so every round starts from the same state
+            for pid, vec in probes:
+                if allocator.request(pid, vec).status == bankers_engine.GRANTED:
+                    allocator.release(pid, vec)
+        return run
+
+    variants.append(Variant("engine-request-x16", engine_requests))
+    variants.append(Variant("allocator-request-x16", allocator_requests))
+
+    try:
+        import bankers_numpy
+    except ImportError:
+        return variants
+
+    def numpy_safety(state):
+        arr = bankers_numpy.ArrayState.from_state(state)
+        return lambda: bankers_numpy.safety_check(arr)
+
+    def numpy_batch(state):
+        arr = bankers_numpy.ArrayState.from_state(state)
+        probes = _request_probes(state, random.Random(0), 16)
+        pids = [p for p, _ in probes]
+        vecs = [v for _, v in probes]
+        return lambda: bankers_numpy.request_batch(arr, pids, vecs)
+
+    variants.append(Variant("numpy-safety", numpy_safety))
+    variants.append(Variant("numpy-request-batch-x16", numpy_batch))
+    return variants
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    k = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def measure(fn, repeats, budget):
+    """Times ``fn`` up to ``repeats`` times or until ``budget`` seconds pass."""
+    samples = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < repeats:
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            break
+    samples.sort()
+    total = sum(samples)
+    return {
+        "runs": len(samples),
+        "p50": _percentile(samples, 0.50),
+        "p90": _percentile(samples, 0.90),
+        "p99": _percentile(samples, 0.99),
+        "max": samples[-1],
+        "throughput": len(samples) / total if total else None,
+    }
+
+
+def peak_memory(fn):
+    """Peak bytes allocated by one call of ``fn``, as seen by tracemalloc."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_sweep(ns, ms, kinds, variant_names=None, repeats=20, budget=2.0, seed=0,
+              max_cells=10 ** 7, memory=True):
+    """Yields one result dict per (generator, n, m, variant) point."""
+    variants = [v for v in _variants() if not variant_names or v.name in variant_names]
+    for kind in kinds:
+        for n in ns:
+            for m in ms:
+                if n * m > max_cells:
+                    continue
+                state = generate(kind, n, m, seed)
+                for variant in variants:
+                    if not variant.applies(n, m):
+                        continue
+                    fn = variant.prepare(state)
+                    result = {"generator": kind, "n": n, "m": m, "variant": variant.name, "seed": seed}
+                    result.update(measure(fn, repeats, budget))
+                    if memory:
+                        result["peak_bytes"] = peak_memory(fn)
+                    yield result
+
+
+def compare(results, baseline_path, tolerance):
+    """Returns the points whose p50 is more than ``tolerance`` times the baseline's."""
+    baseline = {}
+    with open(baseline_path) as f:
+        for line in f:
+            if line.strip():
+                r = json.loads(line)
+                baseline[(r["generator"], r["n"], r["m"], r["variant"])] = r
+    regressions = []
+    for r in results:
+        old = baseline.get((r["generator"], r["n"], r["m"], r["variant"]))
+        if old and old["p50"] and r["p50"] > tolerance * old["p50"]:
+            regressions.append((r, r["p50"] / old["p50"]))
+    return regressions
+
+
+def _int_list(text):
+    return [int(v) for v in text.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Banker's Algorithm engines")
+    parser.add_argument("--n", type=_int_list, default=[10, 100, 1000, 10000], help="process counts")
+    parser.add_argument("--m", type=_int_list, default=[1, 10, 100], help="resource type counts")
+    parser.add_argument("--generators", default=",".join(GENERATORS), help="comma-separated generators")
+    parser.add_argument("--variants", default="", help="comma-separated variant names (default: all)")
+    parser.add_argument("--repeats", type=int, default=20, help="timed runs per point")
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds per point before stopping early")
+    parser.add_argument("--max-cells", type=int, default=10 ** 7, help="skip points with n*m above this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("-o", "--output", default="-", help="JSON-lines result file (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON-lines file to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed p50 slowdown vs baseline")
+    args = parser.parse_args(argv)
+
+    kinds = [k for k in args.generators.split(",") if k]
+    unknown = set(kinds) - set(GENERATORS)
+    if unknown:
+        parser.error(f"unknown generators: {', '.join(sorted(unknown))}")
+    names = [v for v in args.variants.split(",") if v]
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    results = []
+    try:
+        for result in run_sweep(args.n, args.m, kinds, names, args.repeats, args.budget,
+                                args.seed, args.max_cells, not args.no_memory):
+            results.append(result)
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            print(f"{result['generator']:>11} n={result['n']:<7} m={result['m']:<5} "
+                  f"{result['variant']:<24} p50={result['p50'] * 1e3:9.3f}ms "
+                  f"p99={result['p99'] * 1e3:9.3f}ms", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for r, ratio in regressions:
+            print(f"REGRESSION {r['generator']} n={r['n']} m={r['m']} {r['variant']}: "
+                  f"{ratio:.2f}x slower", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
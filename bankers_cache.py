@@ -0,0 +1,87 @@
+"""Safety-verdict cache keyed by a fingerprint of the state.
+
+The fingerprint XORs one hash per (matrix, row, column, value) cell of
+Available, Allocation and Max, so changing a few cells updates it in time
+proportional to the cells changed. A verdict is a pure function of those
+three matrices, so any change to the state (a grant, a release,
+recomputing Available from Total) changes the key. Different states can
+still collide on a fingerprint, so callers must check a cached sequence
+against the state before using it (see :mod:`bankers_allocator`).
+"""
+from collections import OrderedDict
+
+from bankers_metrics import REGISTRY
+
+_LOOKUPS = REGISTRY.counter("bankers_cache_lookups_total", "Safety cache lookups, by result.", ("result",))
+
+AVAILABLE = 0
+ALLOCATION = 1
+MAXIMUM = 2
+
+
+def cell_hash(kind, i, j, value):
+    """Hash contribution of one cell; XOR it in and out to update a fingerprint."""
+    return hash((kind, i, j, value))
+
+
+def state_fingerprint(state):
+    """Computes the fingerprint of a :class:`bankers_engine.BankersState`."""
+    h = 0
+    for j, v in enumerate(state.available):
+        h ^= cell_hash(AVAILABLE, 0, j, v)
+    for i in range(state.n):
+        alloc, max_row = state.allocation[i], state.maximum[i]
+        for j in range(state.m):
+            h ^= cell_hash(ALLOCATION, i, j, alloc[j])
+            h ^= cell_hash(MAXIMUM, i, j, max_row[j])
+    return h
+
+
+class SafetyCache:
+    """Bounded LRU map from state fingerprint to ``(safe, sequence)``.
+
+    ``sequence`` is the safe sequence, or for unsafe states the processes
+    that could still finish. A capacity of 0 disables caching.
+    """
+
+    def __init__(self, capacity=1024):
+        if capacity < 0:
+            raise ValueError("capacity cannot be negative")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the cached ``(safe, sequence)`` for ``key`` or None."""
+        if not self.capacity:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            if REGISTRY.enabled:
+                _LOOKUPS.inc("miss")
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if REGISTRY.enabled:
+            _LOOKUPS.inc("hit")
+        return entry
+
+    def put(self, key, safe, sequence):
+        """Stores a verdict, evicting the least recently used entry if full."""
+        if not self.capacity:
+            return
+        self._entries[key] = (safe, tuple(sequence))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops all entries and resets the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,96 @@
+"""One-shot safety or request check for scripts and admission hooks.
+
+Reads one JSON state (``allocation``, ``max``, ``available``; rows may be
+sparse as in :func:`bankers_sparse.load_state`) from a file or stdin, prints
+one JSON line and reports the verdict in the exit status, so a shell script
+can branch on it without parsing anything::
+
+    python bankers_check.py state.json                       # is the state safe?
+    python bankers_check.py state.json --request 1 1,0,2     # may P1 get [1, 0, 2]?
+    cat state.json | python bankers_check.py - -q
+
+Exit status:
+
+    0  safe / request granted
+    1  unsafe / request denied
+    2  invalid input or usage (the error goes to stderr)
+    3  request must wait
+
+Only the engine modules are imported, never Tkinter, so a cold start costs
+little more than starting the interpreter.
+"""
+import argparse
+import json
+import sys
+
+from bankers_engine import DENIED, GRANTED, WAIT, BankersError
+from bankers_sparse import engine_for, load_state
+
+EXIT_OK = 0
+EXIT_REJECTED = 1
+EXIT_INVALID = 2
+EXIT_WAIT = 3
+
+_STATUS_EXIT = {GRANTED: EXIT_OK, DENIED: EXIT_REJECTED, WAIT: EXIT_WAIT}
+
+
+def check(data, request=None):
+    """Evaluates a scenario dict; returns ``(exit_status, result_dict)``.
+
+    ``request`` is ``(pid, vector)`` or None for a plain safety check.
+    Raises :class:`bankers_engine.BankersError` for invalid input.
+    """
+    state = load_state(data)
+    engine = engine_for(state)
+    if request is None:
+        result = engine.safety_check(state)
+        return (EXIT_OK if result.safe else EXIT_REJECTED,
+                {"safe": result.safe, "sequence": result.sequence if result.safe else None})
+    pid, vector = request
+    result = engine.request(state, pid, vector)
+    return _STATUS_EXIT[result.status], {"status": result.status, "sequence": result.sequence}
+
+
+def _vector(text):
+    try:
+        return [int(v) for v in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got {text!r}") from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a Banker's state or request; the verdict is the exit status")
+    parser.add_argument("state", help="JSON state file, or - for stdin")
+    parser.add_argument("--request", nargs=2, metavar=("PID", "VECTOR"),
+                        help="check a request instead, e.g. --request 1 1,0,2")
+    parser.add_argument("-q", "--quiet", action="store_true", help="print nothing, only set the exit status")
+    args = parser.parse_args(argv)
+
+    request = None
+    if args.request:
+        try:
+            request = (int(args.request[0]), _vector(args.request[1]))
+        except (ValueError, argparse.ArgumentTypeError) as exc:
+            print(f"Error: invalid request: {exc}", file=sys.stderr)
+            return EXIT_INVALID
+
+    try:
+        if args.state == "-":
+            data = json.load(sys.stdin)
+        else:
+            with open(args.state) as f:
+                data = json.load(f)
+        if not isinstance(data, dict):
+            raise BankersError("expected a JSON object")
+        status, result = check(data, request)
+    except (OSError, ValueError, TypeError) as exc:
+        # BankersError and json.JSONDecodeError are ValueErrors
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_INVALID
+    if not args.quiet:
+        print(json.dumps(result))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""Deadlock detection from outstanding requests, kept up to date incrementally.
+
+The Safety algorithm asks whether every process could finish if each one
+claimed its full Max. Detection asks what is deadlocked *now*: each process
+is assumed to need only its current Request, and a process that can get it
+finishes and returns its Allocation. Processes that can never finish that
+way are exactly the deadlocked set.
+
+:class:`DeadlockDetector` keeps the finish order and the Work vector before
+each step, like :class:`bankers_allocator.BankersAllocator` keeps its
+proof. An event only shifts Work for the steps it affects. If every step
+still fits, nothing else is done; otherwise the order is kept up to the
+first step that broke and rebuilt from there. Events that can only free
+processes (releases, withdrawn requests) just try the deadlocked processes
+against the final Work. A full O(n*m log n) scan is needed only on load.
+
+:meth:`DeadlockDetector.victims` suggests processes to abort so that all
+the others can finish: an exact search when the deadlocked set is small,
+otherwise a greedy choice pruned of victims that turned out unnecessary.
+Each greedy round runs detection only over the processes still blocked, and
+only for the few candidates that hold most of what those processes lack.
+"""
+import heapq
+from collections import namedtuple
+
+from bankers_engine import BankersError, BankersState, safety_check
+
+# Deadlocked sets up to this size get an exact minimum-cost victim search
+EXACT_LIMIT = 12
+
+# Candidates per greedy round whose full effect is worked out
+GREEDY_WIDTH = 8
+
+# Processes to abort, their total cost, and whether the set is proven minimal
+VictimSet = namedtuple("VictimSet", "pids cost exact")
+
+
+def _vector(vec, m, what):
+    vec = [int(v) for v in vec]
+    if len(vec) != m:
+        raise BankersError(f"{what} must have {m} resource values.")
+    if any(v < 0 for v in vec):
+        raise BankersError(f"{what} values cannot be negative.")
+    return vec
+
+
+def _finish(allocation, request, work, pids):
+    # Runs detection over ``pids`` starting from ``work``; returns (order, works, final)
+    sub = BankersState._from_parts([allocation[p] for p in pids], None, work,
+                                   [request[p] for p in pids])
+    order, works = [], []
+
+    def record(k, before, after):
+        order.append(pids[k])
+        works.append(before)
+
+    result = safety_check(sub, on_step=record)
+    return order, works, result.work
+
+
+class DeadlockDetector:
+    """Allocation, Request and Available with the current finish order.
+
+    The detector keeps its own copies of the rows. Call the event methods
+    as the system changes; :attr:`deadlocked` is always current.
+    """
+
+    def __init__(self, allocation, request, available):
+        m = len(available)
+        self.available = _vector(available, m, "Available")
+        if len(request) != len(allocation):
+            raise BankersError("Allocation and Request must have the same number of processes.")
+        self.allocation = [_vector(row, m, f"P{i} Allocation") for i, row in enumerate(allocation)]
+        self.request = [_vector(row, m, f"P{i} Request") for i, row in enumerate(request)]
+        self.n = len(allocation)
+        self.m = m
+        self.full_scans = 0
+        self.repairs = 0
+        self._rebuild(0)
+
+    @classmethod
+    def from_state(cls, state, requests=None):
+        """Builds a detector for a :class:`bankers_engine.BankersState`.
+
+        ``requests`` maps pids to outstanding request vectors; processes
+        not in it request nothing. ``None`` uses each process's Need, i.e.
+        every process asks for its full remaining claim.
+        """
+        if requests is None:
+            request = [row[:] for row in state.need]
+        else:
+            request = [[0] * state.m for _ in range(state.n)]
+            for pid, vec in requests.items():
+                if not 0 <= pid < state.n:
+                    raise BankersError("Invalid Process ID")
+                request[pid] = [a + b for a, b in zip(request[pid], vec)]
+        return cls(state.allocation, request, state.available)
+
+    # --- Results ----------------------------------------------------------
+
+    @property
+    def deadlocked(self):
+        """Sorted pids of the processes that can never finish."""
+        position = self._position
+        return [p for p in range(self.n) if p not in position]
+
+    @property
+    def order(self):
+        """Processes that can finish, in the order they would."""
+        return list(self._order)
+
+    def is_deadlocked(self, pid):
+        return pid not in self._position
+
+    # --- Finish order maintenance -------------------------------------------
+
+    def _rebuild(self, start):
+        # Keeps the first ``start`` steps and finishes everything else from there
+        if start == 0:
+            self.full_scans += 1
+            work = self.available[:]
+            order, works = [], []
+        else:
+            self.repairs += 1
+            order, works = self._order[:start], self._works[:start]
+            # Work after the kept prefix is the Work before step ``start``
+            work = self._works[start][:] if start < len(self._order) else self._work[:]
+        done = set(order)
+        rest = [p for p in range(self.n) if p not in done]
+        more, more_works, final = _finish(self.allocation, self.request, work, rest)
+        self._order = order + more
+        self._works = works + more_works
+        self._work = final
+        self._position = {p: k for k, p in enumerate(self._order)}
+
+    def _shift(self, pid, delta, sign):
+        # Adds sign * delta to Work at every step up to and including pid's;
+        # returns the first step that no longer fits, or None
+        k = self._position.get(pid)
+        last = len(self._order) if k is None else k + 1
+        cols = [(j, sign * d) for j, d in enumerate(delta) if d]
+        works, order, request = self._works, self._order, self.request
+        broken = None
+        if sign > 0:
+            for i in range(last):
+                w = works[i]
+                for j, d in cols:
+                    w[j] += d
+        else:
+            for i in range(last):
+                w = works[i]
+                row = request[order[i]]
+                for j, d in cols:
+                    w[j] += d
+                    if row[j] > w[j] and broken is None:
+                        broken = i
+        if k is None:
+            for j, d in cols:
+                self._work[j] += d
+        return broken
+
+    def _check_pid(self, pid):
+        if not 0 <= pid < self.n:
+            raise BankersError("Invalid Process ID")
+
+    # --- Events -----------------------------------------------------------
+
+    def add_request(self, pid, vec):
+        """``pid`` now also waits for ``vec``."""
+        self._check_pid(pid)
+        vec = _vector(vec, self.m, "Request")
+        row = self.request[pid]
+        for j, v in enumerate(vec):
+            row[j] += v
+        k = self._position.get(pid)
+        if k is not None and any(r > w for r, w in zip(row, self._works[k])):
+            self._rebuild(k)
+
+    def withdraw(self, pid, vec):
+        """``pid`` no longer waits for ``vec`` (it gave up or timed out)."""
+        self._check_pid(pid)
+        vec = _vector(vec, self.m, "Request")
+        row = self.request[pid]
+        if any(v > r for v, r in zip(vec, row)):
+            raise BankersError("Withdrawal exceeds Request")
+        for j, v in enumerate(vec):
+            row[j] -= v
+        if pid not in self._position:
+            self._rebuild(len(self._order))
+
+    def grant(self, pid, vec):
+        """Allocates ``vec`` of ``pid``'s outstanding request from Available."""
+        self._check_pid(pid)
+        vec = _vector(vec, self.m, "Grant")
+        if any(v > r for v, r in zip(vec, self.request[pid])):
+            raise BankersError("Grant exceeds Request")
+        for j, v in enumerate(vec):
+            self.request[pid][j] -= v
+        self.acquire(pid, vec)
+
+    def acquire(self, pid, vec):
+        """Allocates ``vec`` to ``pid`` from Available without touching its request."""
+        self._check_pid(pid)
+        vec = _vector(vec, self.m, "Allocation")
+        if any(v > a for v, a in zip(vec, self.available)):
+            raise BankersError("Allocation exceeds Available")
+        row = self.allocation[pid]
+        for j, v in enumerate(vec):
+            row[j] += v
+            self.available[j] -= v
+        # Deadlocked processes stay deadlocked: Work only shrank, and a
+        # granted process's request shrank by as much as the final Work
+        broken = self._shift(pid, vec, -1)
+        if broken is not None:
+            self._rebuild(broken)
+
+    def release(self, pid, vec):
+        """``pid`` gives back ``vec`` of its Allocation."""
+        self._check_pid(pid)
+        vec = _vector(vec, self.m, "Release")
+        row = self.allocation[pid]
+        if any(v > a for v, a in zip(vec, row)):
+            raise BankersError("Release exceeds Allocation")
+        for j, v in enumerate(vec):
+            row[j] -= v
+            self.available[j] += v
+        self._shift(pid, vec, 1)
+        if pid not in self._position:
+            self._rebuild(len(self._order))
+
+    # --- Victim selection -------------------------------------------------
+
+    def _default_cost(self, pid):
+        # One per aborted process plus the units of work it loses
+        return 1 + sum(self.allocation[pid])
+
+    def _left_after(self, victims, pids, work=None):
+        # Processes of ``pids`` that still cannot finish from ``work`` (default:
+        # the final Work) once ``victims`` are aborted
+        work = (self._work if work is None else work)[:]
+        for v in victims:
+            for j, a in enumerate(self.allocation[v]):
+                work[j] += a
+        skip = set(victims)
+        rest = [p for p in pids if p not in skip]
+        request = self.request
+        if not any(all(r <= w for r, w in zip(request[p], work)) for p in rest):
+            # Nothing fits, so no need to sort the columns
+            return rest, work
+        order, _, final = _finish(self.allocation, request, work, rest)
+        finished = set(order)
+        return [p for p in rest if p not in finished], final
+
+    def victims(self, cost=None, exact_limit=EXACT_LIMIT, on_candidate=None):
+        """Suggests processes to abort so every other process can finish.
+
+        ``cost(pid)`` prices aborting a process (default: one plus the
+        units it holds). Returns a :class:`VictimSet`; ``exact`` is True
+        when the set was proven to have the minimum total cost.
+        ``on_candidate()``, if given, is called before every candidate set
+        is tried; an exception it raises (e.g. a cancellation) stops the
+        search.
+        """
+        cost = cost or self._default_cost
+        dead = self.deadlocked
+        if not dead:
+            return VictimSet([], 0, True)
+        prices = {p: cost(p) for p in dead}
+
+        # Greedy: abort whichever process unblocks the most per unit of cost.
+        # Each round scores candidates only against the processes still
+        # blocked, and works out the full effect only for the GREEDY_WIDTH
+        # whose units best cover what those processes are short of
+        chosen = []
+        left, work = dead, self._work[:]
+        while left:
+            short = [0] * self.m
+            for q in left:
+                for j, (r, w) in enumerate(zip(self.request[q], work)):
+                    if r - w > short[j]:
+                        short[j] = r - w
+
+            def cover(p):
+                units = sum(min(a, s) for a, s in zip(self.allocation[p], short))
+                return units / prices[p] if prices[p] > 0 else float("inf")
+
+            best = None
+            for p in heapq.nsmallest(GREEDY_WIDTH, left, key=lambda p: (-cover(p), prices[p], p)):
+                if on_candidate is not None:
+                    on_candidate()
+                remaining, final = self._left_after([p], left, work)
+                freed = len(left) - len(remaining)
+                key = (freed / prices[p] if prices[p] > 0 else float("inf"), -prices[p], -p)
+                if best is None or key > best[0]:
+                    best = (key, p, remaining, final)
+            chosen.append(best[1])
+            left, work = best[2], best[3]
+
+        # Pruning: drop victims, most expensive first, that are not needed after all
+        for p in sorted(chosen, key=lambda p: -prices[p]):
+            if on_candidate is not None:
+                on_candidate()
+            trial = [v for v in chosen if v != p]
+            if not self._left_after(trial, dead)[0]:
+                chosen = trial
+        best_cost = sum(prices[p] for p in chosen)
+
+        if len(dead) > exact_limit:
+            return VictimSet(sorted(chosen), best_cost, False)
+
+        # Branch and bound over subsets, bounded by the pruned greedy cost
+        best = [sorted(chosen), best_cost]
+
+        def search(i, picked, total):
+            if total >= best[1]:
+                return
+            if on_candidate is not None:
+                on_candidate()
+            if not self._left_after(picked, dead)[0]:
+                best[0], best[1] = sorted(picked), total
+                return
+            for k in range(i, len(dead)):
+                p = dead[k]
+                picked.append(p)
+                search(k + 1, picked, total + prices[p])
+                picked.pop()
+
+        search(0, [], 0)
+        return VictimSet(best[0], best[1], True)
@@ -0,0 +1,268 @@
+"""Headless Banker's Algorithm engine.
+
+Holds the Allocation/Max/Available state of a system and implements the
+Safety and Resource-Request algorithms without any GUI dependency, so the
+same code can back the Tkinter simulator and run on display-less machines.
+"""
+import heapq
+import numbers
+from collections import namedtuple
+
+GRANTED = "granted"
+DENIED = "denied"
+WAIT = "wait"
+
+# Outcome of a safety check: ``sequence`` holds every process that could
+# finish (all of them when ``safe``), ``work`` is the final Work vector.
+SafetyResult = namedtuple("SafetyResult", "safe sequence work")
+
+# Outcome of a resource request: ``state`` is the new state when granted,
+# otherwise the unchanged input state.
+RequestResult = namedtuple("RequestResult", "status sequence state")
+
+
+class BankersError(ValueError):
+    """Raised for states or requests the Banker's Algorithm cannot accept."""
+
+
+class BankersState:
+    """Allocation, Max and Available of a system, with Need derived from them.
+
+    Rows are treated as immutable once the state is built; operations that
+    change the state return a new object sharing the untouched rows.
+    """
+
+    def __init__(self, allocation, maximum, available):
+        allocation = [list(row) for row in allocation]
+        maximum = [list(row) for row in maximum]
+        available = list(available)
+        n = len(allocation)
+        m = len(available)
+
+        if len(maximum) != n:
+            raise BankersError("Allocation and Max must have the same number of processes.")
+        if any(v < 0 for v in available):
+            raise BankersError("Available cannot be negative.")
+
+        need = []
+        for i in range(n):
+            if len(allocation[i]) != m or len(maximum[i]) != m:
+                raise BankersError(f"P{i}: expected {m} resource columns.")
+            row = []
+            for j in range(m):
+                if allocation[i][j] < 0 or maximum[i][j] < 0:
+                    raise BankersError(f"P{i}: values cannot be negative.")
+                n_val = maximum[i][j] - allocation[i][j]
+                if n_val < 0:
+                    raise BankersError(f"P{i}: Allocation cannot exceed Max!")
+                row.append(n_val)
+            need.append(row)
+
+        self.allocation = allocation
+        self.maximum = maximum
+        self.available = available
+        self.need = need
+        self.n = n
+        self.m = m
+
+    @classmethod
+    def _from_parts(cls, allocation, maximum, available, need):
+        # Trusted constructor for states derived from an already valid one
+        state = cls.__new__(cls)
+        state.allocation = allocation
+        state.maximum = maximum
+        state.available = available
+        state.need = need
+        state.n = len(allocation)
+        state.m = len(available)
+        return state
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a state from ``{"allocation": ..., "max": ..., "available": ...}``."""
+        try:
+            return cls(data["allocation"], data["max"], data["available"])
+        except KeyError as exc:
+            raise BankersError(f"Missing field {exc.args[0]!r}.") from None
+
+    def to_dict(self):
+        """Returns the state as plain lists, the inverse of :meth:`from_dict`."""
+        return {
+            "allocation": [row[:] for row in self.allocation],
+            "max": [row[:] for row in self.maximum],
+            "available": self.available[:],
+        }
+
+    def copy(self):
+        """Returns a deep copy that can be modified independently."""
+        return BankersState._from_parts(
+            [row[:] for row in self.allocation],
+            [row[:] for row in self.maximum],
+            self.available[:],
+            [row[:] for row in self.need],
+        )
+
+    def __repr__(self):
+        return f"BankersState(n={self.n}, m={self.m}, available={self.available})"
+
+
+def to_int(value):
+    """Returns ``value`` as an int, for counts and IDs read from JSON or CSV.
+
+    JSON numbers may arrive as floats, so whole floats such as ``2.0`` are
+    accepted. Fractions, infinities, NaN, strings and bools raise
+    :class:`BankersError` instead of being truncated or parsed.
+    """
+    if isinstance(value, bool) or not isinstance(value, (numbers.Integral, float)):
+        raise BankersError(f"expected an integer, got {value!r}")
+    if isinstance(value, float) and not value.is_integer():
+        raise BankersError(f"expected an integer, got {value!r}")
+    return int(value)
+
+
+def available_from_total(total, allocation):
+    """Computes Available = Total - column sums of Allocation.
+
+    Entries may come out negative when Allocation exceeds Total; callers
+    decide how to report that.
+    """
+    avail = list(total)
+    for row in allocation:
+        for j, v in enumerate(row):
+            avail[j] -= v
+    return avail
+
+
+def safety_check(state, on_step=None):
+    """Runs the Safety algorithm and returns a :class:`SafetyResult`.
+
+    Each resource column keeps the processes sorted by Need, and each
+    process counts the columns it is still blocked on. When Work grows in a
+    column, the pointer into that column only moves forward, so every
+    process is unblocked at most once per resource and the whole check costs
+    O(n*m log n) instead of rescanning every unfinished process per pass.
+
+    Among runnable processes the lowest index finishes first. ``on_step`` is
+    called as ``on_step(pid, work_before, work_after)`` for each process.
+    """
+    n, m = state.n, state.m
+    need = state.need
+    alloc = state.allocation
+    work = state.available[:]
+
+    columns = [sorted(range(n), key=[row[j] for row in need].__getitem__) for j in range(m)]
+    ptr = [0] * m
+    blocked = [m] * n
+    ready = [p for p in range(n) if m == 0]
+
+    def advance(j):
+        col = columns[j]
+        w = work[j]
+        k = ptr[j]
+        while k < n and need[col[k]][j] <= w:
+            p = col[k]
+            blocked[p] -= 1
+            if blocked[p] == 0:
+                heapq.heappush(ready, p)
+            k += 1
+        ptr[j] = k
+
+    for j in range(m):
+        advance(j)
+
+    sequence = []
+    while ready:
+        p = heapq.heappop(ready)
+        before = work[:] if on_step else None
+        row = alloc[p]
+        for j in range(m):
+            if row[j]:
+                work[j] += row[j]
+        sequence.append(p)
+        if on_step:
+            on_step(p, before, work[:])
+        for j in range(m):
+            if row[j]:
+                advance(j)
+
+    return SafetyResult(len(sequence) == n, sequence, work)
+
+
+def safe_sequence(state, on_step=None):
+    """Returns a safe sequence of process indices, or None if unsafe."""
+    result = safety_check(state, on_step)
+    return result.sequence if result.safe else None
+
+
+def is_safe(state):
+    """Returns True if every process can finish from the given state."""
+    return safety_check(state).safe
+
+
+def provisional_state(state, pid, req_vec):
+    """Returns the state after allocating ``req_vec`` to ``pid``.
+
+    Only the rows of ``pid`` are copied; all other rows are shared.
+    """
+    alloc = state.allocation[:]
+    need = state.need[:]
+    alloc[pid] = [a + r for a, r in zip(alloc[pid], req_vec)]
+    need[pid] = [x - r for x, r in zip(need[pid], req_vec)]
+    avail = [a - r for a, r in zip(state.available, req_vec)]
+    return BankersState._from_parts(alloc, state.maximum, avail, need)
+
+
+def validate_request(state, pid, req_vec):
+    """Raises :class:`BankersError` unless ``req_vec`` is a well-formed request."""
+    if pid < 0 or pid >= state.n:
+        raise BankersError("Invalid Process ID")
+    if len(req_vec) != state.m:
+        raise BankersError(f"Request must have {state.m} resource values.")
+    if any(r < 0 for r in req_vec):
+        raise BankersError("Request values cannot be negative.")
+    if any(r > x for r, x in zip(req_vec, state.need[pid])):
+        raise BankersError("Request exceeds Need")
+
+
+def validate_release(state, pid, rel_vec):
+    """Raises :class:`BankersError` unless ``pid`` holds everything in ``rel_vec``."""
+    if pid < 0 or pid >= state.n:
+        raise BankersError("Invalid Process ID")
+    if len(rel_vec) != state.m:
+        raise BankersError(f"Release must have {state.m} resource values.")
+    if any(r < 0 for r in rel_vec):
+        raise BankersError("Release values cannot be negative.")
+    if any(r > a for r, a in zip(rel_vec, state.allocation[pid])):
+        raise BankersError("Release exceeds Allocation")
+
+
+def release(state, pid, rel_vec):
+    """Returns the state after ``pid`` gives back ``rel_vec``.
+
+    Max is unchanged, so the process's Need grows by the released amount.
+    A release can never make a safe state unsafe.
+    """
+    rel_vec = list(rel_vec)
+    validate_release(state, pid, rel_vec)
+    return provisional_state(state, pid, [-r for r in rel_vec])
+
+
+def request(state, pid, req_vec):
+    """Runs the Resource-Request algorithm for process ``pid``.
+
+    Returns a :class:`RequestResult` whose status is GRANTED (with the new
+    state and its safe sequence), WAIT when the request exceeds Available,
+    or DENIED when granting it would leave the system unsafe. Requests that
+    exceed Need raise :class:`BankersError`.
+    """
+    req_vec = list(req_vec)
+    validate_request(state, pid, req_vec)
+
+    if any(r > a for r, a in zip(req_vec, state.available)):
+        return RequestResult(WAIT, None, state)
+
+    new_state = provisional_state(state, pid, req_vec)
+    seq = safe_sequence(new_state)
+    if seq is None:
+        return RequestResult(DENIED, None, state)
+    return RequestResult(GRANTED, seq, new_state)
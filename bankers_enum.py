@@ -0,0 +1,262 @@
+"""Counting, sampling and optimizing over all safe sequences of a state.
+
+Which processes have finished fully determines Work, so the search is a
+dynamic program over sets of finished processes rather than over orderings.
+Processes with identical Allocation and Need rows are interchangeable, so
+they are grouped into classes. A DP state then only records how many members
+of each class have finished, which shrinks 2^n subsets to the product of
+(class size + 1).
+
+Finishing a runnable process only adds to Work. So if the initial state is
+safe, every reachable state is safe and no branch of the search dead-ends;
+if it is unsafe, there are no safe sequences at all.
+
+Each distinct class ordering stands for prod(size!) process orderings, one
+per way of permuting identical processes. Counts and uniform samples
+account for that; :meth:`SafeSequences.sequences` yields one representative
+per class ordering, with identical processes in index order::
+
+    space = SafeSequences(state)
+    space.count                  # number of safe sequences
+    space.sample()               # uniformly random safe sequence
+    space.min_peak()             # (peak units held, sequence)
+"""
+import math
+import random
+
+from bankers_engine import BankersError, safety_check
+
+# Distinct DP states explored before giving up
+MAX_STATES = 1_000_000
+# States times classes explored before giving up: each state tests every class,
+# so many distinct processes fail fast rather than running for minutes
+MAX_TESTS = 5_000_000
+
+
+def process_classes(state):
+    """Groups processes with identical Allocation and Need rows; returns lists of pids."""
+    groups = {}
+    for p in range(state.n):
+        key = (tuple(state.allocation[p]), tuple(state.need[p]))
+        groups.setdefault(key, []).append(p)
+    return list(groups.values())
+
+
+def units_held(total, need_row, work):
+    """Default step cost: units in use while a process runs holding its whole Max."""
+    return total - sum(work) + sum(need_row)
+
+
+class SafeSequences:
+    """The space of safe sequences of a :class:`bankers_engine.BankersState`.
+
+    Builds the DP states reachable from the initial state level by level.
+    Raises :class:`bankers_engine.BankersError` if more than ``max_states``
+    distinct states, or more than ``max_tests`` states times classes, would
+    be needed, so a snapshot with thousands of distinct processes fails
+    fast instead of running out of memory. ``on_state()``, if given, is
+    called for every DP state visited here and by the counting and
+    :meth:`min_peak` passes; an exception it raises (e.g. a cancellation)
+    stops the work.
+    """
+
+    def __init__(self, state, max_states=MAX_STATES, on_state=None, max_tests=MAX_TESTS):
+        self.state = state
+        self.on_state = on_state
+        self.classes = process_classes(state)
+        self.safe = safety_check(state).safe
+        self._alloc = [state.allocation[c[0]] for c in self.classes]
+        self._need = [state.need[c[0]] for c in self.classes]
+        self._sizes = [len(c) for c in self.classes]
+        # A DP state is one int: finished counts per class in mixed radix
+        self._stride = []
+        stride = 1
+        for size in self._sizes:
+            self._stride.append(stride)
+            stride *= size + 1
+        self._levels = []
+        self._runnable = {}
+        self._ways = None
+        if self.safe:
+            self._explore(max_states, max_tests)
+
+    def _counts(self, key):
+        return [key // stride % (size + 1) for stride, size in zip(self._stride, self._sizes)]
+
+    def _work(self, key):
+        work = self.state.available[:]
+        for c, k in enumerate(self._counts(key)):
+            if k:
+                for j, a in enumerate(self._alloc[c]):
+                    work[j] += k * a
+        return work
+
+    def _explore(self, max_states, max_tests):
+        # Only the current level keeps Work vectors; earlier levels keep their keys
+        sizes, need, alloc, strides = self._sizes, self._need, self._alloc, self._stride
+        classes = len(sizes)
+        max_states = min(max_states, max_tests // max(classes, 1))
+        runnable = self._runnable
+        on_state = self.on_state
+        level = {0: self.state.available[:]}
+        explored = 1
+        for _ in range(self.state.n):
+            self._levels.append(list(level))
+            following = {}
+            for key, work in level.items():
+                if on_state is not None:
+                    on_state()
+                ready = tuple(c for c in range(classes)
+                              if key // strides[c] % (sizes[c] + 1) < sizes[c]
+                              and all(x <= w for x, w in zip(need[c], work)))
+                runnable[key] = ready
+                for c in ready:
+                    nxt = key + strides[c]
+                    if nxt not in following:
+                        following[nxt] = [w + a for w, a in zip(work, alloc[c])]
+                        explored += 1
+                        if explored > max_states:
+                            raise BankersError(f"More than {max_states} distinct states to explore "
+                                               f"({classes} groups of processes).")
+            level = following
+        self._levels.append(list(level))
+        runnable[self._levels[-1][0]] = ()
+
+    @property
+    def states(self):
+        """Number of distinct DP states explored."""
+        return sum(len(level) for level in self._levels)
+
+    def _successor(self, key, c):
+        return key + self._stride[c]
+
+    def _class_ways(self):
+        # Completions in class orderings from every state, computed once from the end
+        if self._ways is None:
+            on_state = self.on_state
+            ways = {}
+            if self._levels:
+                ways[self._levels[-1][0]] = 1
+                for level in reversed(self._levels[:-1]):
+                    for key in level:
+                        if on_state is not None:
+                            on_state()
+                        ways[key] = sum(ways[self._successor(key, c)] for c in self._runnable[key])
+            self._ways = ways
+        return self._ways
+
+    @property
+    def class_count(self):
+        """Number of safe orderings when identical processes are not told apart."""
+        if not self.safe:
+            return 0
+        return self._class_ways()[self._levels[0][0]]
+
+    @property
+    def count(self):
+        """Number of safe sequences of processes."""
+        permutations = 1
+        for size in self._sizes:
+            permutations *= math.factorial(size)
+        return self.class_count * permutations
+
+    def _expand(self, class_order, rng=None):
+        # Maps a class ordering to pids, shuffling identical processes if ``rng`` is given
+        members = [list(c) for c in self.classes]
+        if rng is not None:
+            for group in members:
+                rng.shuffle(group)
+        taken = [0] * len(members)
+        seq = []
+        for c in class_order:
+            seq.append(members[c][taken[c]])
+            taken[c] += 1
+        return seq
+
+    def sample(self, rng=None):
+        """Returns a safe sequence drawn uniformly at random, or None if unsafe."""
+        if not self.safe:
+            return None
+        rng = rng or random.Random()
+        ways = self._class_ways()
+        key = self._levels[0][0]
+        order = []
+        for _ in range(self.state.n):
+            pick = rng.randrange(ways[key])
+            for c in self._runnable[key]:
+                nxt = self._successor(key, c)
+                if pick < ways[nxt]:
+                    break
+                pick -= ways[nxt]
+            order.append(c)
+            key = nxt
+        return self._expand(order, rng)
+
+    def min_peak(self, cost=None):
+        """Returns ``(peak, sequence)`` minimizing the largest step cost, or None if unsafe.
+
+        ``cost(need_row, work_before)`` prices running a process from a given
+        Work; the default is :func:`units_held`, so the result is the order
+        that keeps the fewest units in use at its busiest step.
+        """
+        if not self.safe:
+            return None
+        if cost is None:
+            state = self.state
+            total = sum(state.available) + sum(sum(row) for row in state.allocation)
+            cost = lambda need_row, work: units_held(total, need_row, work)
+        on_state = self.on_state
+        best = {self._levels[-1][0]: (-math.inf, None)}
+        for level in reversed(self._levels[:-1]):
+            for key in level:
+                if on_state is not None:
+                    on_state()
+                work = self._work(key)
+                choice = None
+                for c in self._runnable[key]:
+                    peak = max(cost(self._need[c], work), best[self._successor(key, c)][0])
+                    if choice is None or peak < choice[0]:
+                        choice = (peak, c)
+                best[key] = choice
+        key = self._levels[0][0]
+        peak = best[key][0]
+        order = []
+        for _ in range(self.state.n):
+            c = best[key][1]
+            order.append(c)
+            key = self._successor(key, c)
+        return (peak if self.state.n else 0), self._expand(order)
+
+    def sequences(self):
+        """Yields every safe class ordering as a pid sequence, in lexicographic class order."""
+        if not self.safe:
+            return
+        n = self.state.n
+        key = self._levels[0][0]
+        order = []
+        stack = [iter(self._runnable[key])]
+        path = [key]
+        if n == 0:
+            yield []
+            return
+        while stack:
+            c = next(stack[-1], None)
+            if c is None:
+                stack.pop()
+                path.pop()
+                if order:
+                    order.pop()
+                continue
+            order.append(c)
+            nxt = self._successor(path[-1], c)
+            if len(order) == n:
+                yield self._expand(order)
+                order.pop()
+                continue
+            path.append(nxt)
+            stack.append(iter(self._runnable[nxt]))
+
+
+def count_safe_sequences(state, max_states=MAX_STATES):
+    """Returns how many safe sequences ``state`` has."""
+    return SafeSequences(state, max_states).count
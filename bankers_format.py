@@ -0,0 +1,327 @@
+"""On-disk scenario formats: compact binary, JSON lines and CSV.
+
+Binary layout (all little-endian)::
+
+    file header    b"BNKR", uint32 version
+    per scenario   uint32 n, uint32 m,
+                   int32 allocation[n*m], int32 max[n*m], int32 available[m]
+
+Scenarios are stored back to back. :func:`open_binary` memory-maps a file
+and yields :class:`ScenarioView` objects whose matrices are ``memoryview``
+slices of the mapping, so nothing is parsed or copied until a scenario is
+converted with :meth:`ScenarioView.to_state` or, without copying the
+matrices, :meth:`ScenarioView.to_arrays`.
+
+JSON files hold one ``{"allocation", "max", "available"}`` object per line
+(the :mod:`bankers_batch` input format). CSV files hold one row per matrix
+row: ``scenario,matrix,process,R0,R1,...`` with ``matrix`` one of
+``allocation``, ``max`` or ``available``.
+
+Convert between formats by extension (``.bks``, ``.jsonl``/``.json``,
+``.csv``)::
+
+    python bankers_format.py snapshots.jsonl snapshots.bks
+"""
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from bankers_engine import BankersError, BankersState
+
+MAGIC = b"BNKR"
+VERSION = 1
+_FILE_HEADER = struct.Struct("<4sI")
+_RECORD_HEADER = struct.Struct("<II")
+_ITEM = 4
+_NATIVE_LE = sys.byteorder == "little"
+
+
+class ScenarioView:
+    """One scenario inside a binary buffer, backed by ``memoryview`` slices.
+
+    ``allocation`` and ``maximum`` are flat row-major views of n*m int32
+    values and ``available`` a view of m values. The views stay valid only
+    while the underlying buffer (e.g. the mapped file) is open.
+    """
+
+    __slots__ = ("index", "offset", "size", "n", "m", "allocation", "maximum", "available", "_raw")
+
+    def __init__(self, buf, index, offset):
+        n, m = _RECORD_HEADER.unpack_from(buf, offset)
+        cells = n * m
+        start = offset + _RECORD_HEADER.size
+        size = _RECORD_HEADER.size + (2 * cells + m) * _ITEM
+        if offset + size > len(buf):
+            raise BankersError(f"Scenario {index} is truncated.")
+        raw = memoryview(buf)[start:offset + size]
+        self.index = index
+        self.offset = offset
+        self.size = size
+        self.n = n
+        self.m = m
+        self._raw = raw
+        ints = raw.cast("i") if _NATIVE_LE else None
+        if ints is not None:
+            self.allocation = ints[:cells]
+            self.maximum = ints[cells:2 * cells]
+            self.available = ints[2 * cells:]
+        else:
+            self.allocation = self.maximum = self.available = None
+
+    def _lists(self):
+        if _NATIVE_LE:
+            return self.allocation.tolist(), self.maximum.tolist(), self.available.tolist()
+        values = array("i", self._raw.tobytes())
+        values.byteswap()
+        cells = self.n * self.m
+        return values[:cells].tolist(), values[cells:2 * cells].tolist(), values[2 * cells:].tolist()
+
+    def to_state(self):
+        """Copies the scenario into a validated :class:`bankers_engine.BankersState`."""
+        alloc, max_flat, avail = self._lists()
+        m = self.m
+        # Row starts; with m == 0 every row is empty, so all start at 0
+        rows = [k * m for k in range(self.n)]
+        return BankersState([alloc[k:k + m] for k in rows], [max_flat[k:k + m] for k in rows], avail)
+
+    def to_arrays(self):
+        """Returns a :class:`bankers_numpy.ArrayState` viewing the buffer without copying.
+
+        Only Need is computed into a new array. Requires NumPy.
+        """
+        import numpy as np
+        from bankers_numpy import ArrayState
+
+        cells = self.n * self.m
+        values = np.frombuffer(self._raw, dtype="<i4")
+        return ArrayState(
+            values[:cells].reshape(self.n, self.m),
+            values[cells:2 * cells].reshape(self.n, self.m),
+            values[2 * cells:],
+        )
+
+    def __repr__(self):
+        return f"ScenarioView(index={self.index}, n={self.n}, m={self.m})"
+
+
+def iter_binary(buf):
+    """Yields a :class:`ScenarioView` for every scenario in a binary buffer."""
+    if len(buf) < _FILE_HEADER.size:
+        raise BankersError("Not a scenario file: too short.")
+    magic, version = _FILE_HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise BankersError("Not a scenario file: bad magic.")
+    if version != VERSION:
+        raise BankersError(f"Unsupported scenario file version {version}.")
+    offset = _FILE_HEADER.size
+    index = 0
+    end = len(buf)
+    while offset < end:
+        if offset + _RECORD_HEADER.size > end:
+            raise BankersError(f"Scenario {index} is truncated.")
+        view = ScenarioView(buf, index, offset)
+        yield view
+        offset += view.size
+        index += 1
+
+
+class ScenarioFile:
+    """A memory-mapped binary scenario file; iterate it for :class:`ScenarioView` objects.
+
+    Use as a context manager; views must not be used after it exits::
+
+        with open_binary("snapshots.bks") as scenarios:
+            for view in scenarios:
+                ...
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise BankersError("Not a scenario file: too short.") from None
+
+    def __iter__(self):
+        return iter_binary(self._map)
+
+    def view_at(self, offset, index=0):
+        """Returns the scenario starting at a byte offset recorded earlier."""
+        return ScenarioView(self._map, index, offset)
+
+    def close(self):
+        try:
+            self._map.close()
+        except BufferError:
+            # A view is still alive; the mapping is released with it
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_binary(path):
+    """Opens a binary scenario file as a :class:`ScenarioFile`."""
+    return ScenarioFile(path)
+
+
+def pack_state(state):
+    """Encodes one state as a binary scenario record."""
+    n, m = state.n, state.m
+    values = array("i")
+    try:
+        for row in state.allocation:
+            values.extend(row)
+        for row in state.maximum:
+            values.extend(row)
+        values.extend(state.available)
+    except OverflowError:
+        raise BankersError("Values must fit in 32-bit signed integers.") from None
+    except TypeError:
+        raise BankersError("Values must be integers.") from None
+    if not _NATIVE_LE:
+        values.byteswap()
+    return _RECORD_HEADER.pack(n, m) + values.tobytes()
+
+
+def write_binary(path, states):
+    """Writes states to a binary scenario file; returns how many were written."""
+    count = 0
+    with open(path, "wb") as f:
+        f.write(_FILE_HEADER.pack(MAGIC, VERSION))
+        for state in states:
+            f.write(pack_state(state))
+            count += 1
+    return count
+
+
+def read_json(path):
+    """Yields states from a JSON-lines file."""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield BankersState.from_dict(json.loads(line))
+
+
+def write_json(path, states):
+    """Writes states as JSON lines; returns how many were written."""
+    count = 0
+    with open(path, "w") as f:
+        for state in states:
+            f.write(json.dumps(state.to_dict()) + "\n")
+            count += 1
+    return count
+
+
+def read_csv(path):
+    """Yields states from a CSV file in ``scenario,matrix,process,R0,...`` layout."""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or header[:3] != ["scenario", "matrix", "process"]:
+            raise BankersError("CSV must start with a scenario,matrix,process header.")
+        current = None
+        parts = None
+        for row in reader:
+            if not row:
+                continue
+            scenario, matrix, values = row[0], row[1], [int(v) for v in row[3:]]
+            if scenario != current:
+                if parts is not None:
+                    yield BankersState(parts["allocation"], parts["max"], parts["available"])
+                current, parts = scenario, {"allocation": [], "max": [], "available": []}
+            if matrix == "available":
+                parts["available"] = values
+            elif matrix in ("allocation", "max"):
+                parts[matrix].append(values)
+            else:
+                raise BankersError(f"Unknown matrix {matrix!r} in CSV.")
+        if parts is not None:
+            yield BankersState(parts["allocation"], parts["max"], parts["available"])
+
+
+def write_csv(path, states):
+    """Writes states to a CSV file; returns how many were written."""
+    count = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        width = None
+        for k, state in enumerate(states):
+            if width is None:
+                width = state.m
+                writer.writerow(["scenario", "matrix", "process"] + [f"R{j}" for j in range(width)])
+            for i, row in enumerate(state.allocation):
+                writer.writerow([k, "allocation", i] + row)
+            for i, row in enumerate(state.maximum):
+                writer.writerow([k, "max", i] + row)
+            writer.writerow([k, "available", ""] + state.available)
+            count += 1
+        if width is None:
+            writer.writerow(["scenario", "matrix", "process"])
+    return count
+
+
+def _format_of(path):
+    if path.endswith(".bks"):
+        return "binary"
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".json")):
+        return "json"
+    raise BankersError(f"Cannot tell the format of {path!r} (use .bks, .jsonl or .csv).")
+
+
+def read_states(path):
+    """Yields the states of a scenario file in any supported format."""
+    kind = _format_of(path)
+    if kind == "json":
+        yield from read_json(path)
+    elif kind == "csv":
+        yield from read_csv(path)
+    else:
+        with open_binary(path) as scenarios:
+            for view in scenarios:
+                yield view.to_state()
+
+
+def write_states(path, states):
+    """Writes states in the format given by the file extension."""
+    writer = {"binary": write_binary, "json": write_json, "csv": write_csv}[_format_of(path)]
+    return writer(path, states)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert Banker's scenario files")
+    parser.add_argument("input", help="source file (.bks, .jsonl or .csv)")
+    parser.add_argument("output", help="destination file (.bks, .jsonl or .csv)")
+    args = parser.parse_args(argv)
+    # Write next to the output under the same extension, then rename, so a bad
+    # record late in the input never leaves a truncated output behind
+    root, ext = os.path.splitext(args.output)
+    partial = f"{root}.partial{ext}"
+    try:
+        count = write_states(partial, read_states(args.input))
+        os.replace(partial, args.output)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    print(f"Converted {count} scenarios", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
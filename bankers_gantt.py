@@ -0,0 +1,179 @@
+"""Zoomable, scrollable safe-sequence Gantt chart for the Tkinter GUI.
+
+Each process in the sequence occupies a slot of ``scale`` pixels. Only the
+slots inside the viewport are drawn. When slots get narrower than
+``MIN_BLOCK`` pixels, consecutive processes are merged into one summary
+block labelled with its range, so the item count stays bounded by the
+viewport width at any zoom level. Group boundaries are aligned to fixed
+multiples, so blocks do not jump around while scrolling.
+
+Setting a new sequence keeps the zoom and scroll position, and redraws
+only if the change reaches the part of the chart that is visible.
+"""
+import math
+import tkinter as tk
+
+SLOT = 80           # default pixels per process: a 60px block plus a 20px arrow
+MIN_SLOT = 0.01
+MAX_SLOT = 200
+MIN_BLOCK = 8       # narrower slots are merged into summary blocks
+ARROW_SLOT = 40     # arrows between blocks only when slots are this wide
+MARGIN = 20
+BLOCK_Y, BLOCK_H = 40, 40
+
+BLOCK_FILL = "#90EE90"
+GROUP_FILL = "#C1F0C1"
+
+
+class GanttChart(tk.Frame):
+    """Canvas with zoom buttons and a horizontal scrollbar showing one sequence."""
+
+    def __init__(self, master, height=150, **kwargs):
+        super().__init__(master, **kwargs)
+        self.sequence = []
+        self.scale = SLOT
+        self._drawn = None
+        self._redraw_pending = False
+
+        tools = tk.Frame(self)
+        tools.pack(side="top", fill="x")
+        tk.Button(tools, text="+", width=2, command=lambda: self.zoom(2)).pack(side="left")
+        tk.Button(tools, text="-", width=2, command=lambda: self.zoom(0.5)).pack(side="left")
+        tk.Button(tools, text="Fit", command=self.fit).pack(side="left", padx=2)
+        self.info = tk.Label(tools, text="", fg="gray")
+        self.info.pack(side="right", padx=4)
+
+        self.canvas = tk.Canvas(self, bg="white", height=height, highlightthickness=0)
+        self.scroll_x = tk.Scrollbar(self, orient="horizontal", command=self.canvas.xview)
+        self.canvas.configure(xscrollcommand=self._on_xscroll)
+        self.canvas.pack(side="top", fill="both", expand=True)
+        self.scroll_x.pack(side="bottom", fill="x")
+
+        self.canvas.bind("<Configure>", lambda e: self._schedule_redraw())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.xview_scroll(-3, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.xview_scroll(3, "units"))
+        self.canvas.bind("<Control-MouseWheel>", lambda e: self.zoom(2 if e.delta > 0 else 0.5, e.x))
+        self.canvas.bind("<Control-Button-4>", lambda e: self.zoom(2, e.x))
+        self.canvas.bind("<Control-Button-5>", lambda e: self.zoom(0.5, e.x))
+
+    # --- Data -----------------------------------------------------------
+
+    def set_sequence(self, sequence):
+        """Shows a new sequence of process indices, keeping zoom and scroll position."""
+        old = self.sequence
+        sequence = list(sequence)
+        common = 0
+        for a, b in zip(old, sequence):
+            if a != b:
+                break
+            common += 1
+        self.sequence = sequence
+        self._update_region()
+        # Slots past the right edge of the viewport are not drawn yet
+        right = self.canvas.canvasx(self.canvas.winfo_width()) - MARGIN
+        if not old or common <= right / self.scale:
+            self._redraw(force=True)
+
+    def clear(self):
+        self.sequence = []
+        self._update_region()
+        self._redraw(force=True)
+
+    def _update_region(self):
+        width = MARGIN * 2 + len(self.sequence) * self.scale
+        self.canvas.configure(scrollregion=(0, 0, width, BLOCK_Y + BLOCK_H + 30))
+        self.info.config(text=f"{len(self.sequence)} processes" if self.sequence else "")
+
+    # --- Zoom -----------------------------------------------------------
+
+    def zoom(self, factor, anchor=None):
+        """Scales slot width by ``factor``, keeping the slot under ``anchor`` (a canvas x) in place."""
+        scale = min(MAX_SLOT, max(MIN_SLOT, self.scale * factor))
+        if scale == self.scale:
+            return
+        if anchor is None:
+            anchor = self.canvas.winfo_width() / 2
+        slot = (self.canvas.canvasx(anchor) - MARGIN) / self.scale
+        self.scale = scale
+        self._update_region()
+        self._scroll_to(MARGIN + slot * scale - anchor)
+        self._redraw(force=True)
+
+    def fit(self):
+        """Zooms so the whole sequence fits the visible width."""
+        if not self.sequence:
+            return
+        width = max(1, self.canvas.winfo_width() - 2 * MARGIN)
+        self.scale = min(SLOT, max(MIN_SLOT, width / len(self.sequence)))
+        self._update_region()
+        self._scroll_to(0)
+        self._redraw(force=True)
+
+    def _scroll_to(self, x):
+        total = MARGIN * 2 + len(self.sequence) * self.scale
+        self.canvas.xview_moveto(max(0.0, x) / total if total else 0.0)
+
+    # --- Drawing --------------------------------------------------------
+
+    def _on_xscroll(self, first, last):
+        self.scroll_x.set(first, last)
+        self._schedule_redraw()
+
+    def _on_wheel(self, event):
+        self.canvas.xview_scroll(-3 if event.delta > 0 else 3, "units")
+
+    def _schedule_redraw(self):
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _visible_slots(self):
+        left = self.canvas.canvasx(0) - MARGIN
+        right = self.canvas.canvasx(self.canvas.winfo_width()) - MARGIN
+        first = max(0, int(left // self.scale))
+        last = min(len(self.sequence), int(math.ceil(right / self.scale)) + 1)
+        return first, last
+
+    def _redraw(self, force=False):
+        self._redraw_pending = False
+        first, last = self._visible_slots()
+        view = (first, last, self.scale)
+        if not force and view == self._drawn:
+            return
+        self._drawn = view
+        canvas = self.canvas
+        canvas.delete("all")
+        seq = self.sequence
+        if not seq:
+            return
+
+        slot = self.scale
+        group = 1 if slot >= MIN_BLOCK else int(math.ceil(MIN_BLOCK / slot))
+        gap = min(20, slot / 4) if slot >= ARROW_SLOT else (1 if slot * group >= 4 else 0)
+        y, h = BLOCK_Y, BLOCK_H
+        start = (first // group) * group
+        for a in range(start, last, group):
+            b = min(a + group, len(seq))
+            x0 = MARGIN + a * slot
+            x1 = MARGIN + b * slot - gap
+            if group == 1:
+                canvas.create_rectangle(x0, y, x1, y + h, fill=BLOCK_FILL, outline="black")
+                if x1 - x0 >= 24:
+                    canvas.create_text((x0 + x1) / 2, y + h / 2, text=f"P{seq[a]}", font=("Arial", 10, "bold"))
+                if gap >= 10 and b < len(seq):
+                    canvas.create_line(x1, y + h / 2, x1 + gap, y + h / 2, arrow=tk.LAST)
+            else:
+                canvas.create_rectangle(x0, y, x1, y + h, fill=GROUP_FILL, outline="#5a9a5a")
+                width = x1 - x0
+                if width >= 90:
+                    label = f"P{seq[a]}..P{seq[b - 1]}"
+                elif width >= 24:
+                    label = str(b - a)
+                else:
+                    label = None
+                if label:
+                    canvas.create_text((x0 + x1) / 2, y + h / 2, text=label, font=("Arial", 8))
+            # Step numbers under the blocks for orientation
+            if (a // group) % max(1, int(math.ceil(60 / (slot * group)))) == 0:
+                canvas.create_text(x0, y + h + 12, text=str(a + 1), anchor="w", font=("Arial", 7), fill="gray")
@@ -0,0 +1,106 @@
+"""Bounded, structured step log.
+
+Log entries are :class:`LogRecord` tuples kept in a ring buffer of fixed
+capacity, so tracing every step of a huge safety check costs a tuple per
+step and the history never grows without limit. Safety steps are stored as
+data (pid, Need row and Work vectors) and only formatted when they are
+displayed or exported.
+
+Every record has a tag: ``pass``, ``fail`` or ``info`` (untagged lines
+count as ``info`` for filtering).
+"""
+from collections import deque, namedtuple
+
+TAGS = ("pass", "fail", "info")
+DEFAULT_CAPACITY = 100_000
+
+# ``step`` is None for plain text, else ``(pid, need, work_before, work_after)``
+LogRecord = namedtuple("LogRecord", "tag text step")
+
+
+def text_record(text, tag=None):
+    """A plain line of text."""
+    return LogRecord(tag, text, None)
+
+
+def step_record(pid, need, work_before, work_after):
+    """A Safety-algorithm step; the vectors must not be mutated afterwards."""
+    return LogRecord("pass", None, (pid, need, work_before, work_after))
+
+
+def filter_tag(record):
+    return record.tag or "info"
+
+
+def render(record):
+    """Returns the ``(text, tag)`` lines shown for a record."""
+    if record.step is None:
+        return [(record.text, record.tag)]
+    pid, need, before, after = record.step
+    return [
+        (f"P{pid} Check: Need {need} <= Work {before}? YES.", "pass"),
+        (f"   -> P{pid} finishes. New Work: {after}", None),
+    ]
+
+
+class StepLog:
+    """Ring buffer of the most recent ``capacity`` log records."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.total = 0
+        self._records = deque(maxlen=capacity)
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def dropped(self):
+        """Records pushed out of the buffer since the last :meth:`clear`."""
+        return self.total - len(self._records)
+
+    def append(self, record):
+        self._records.append(record)
+        self.total += 1
+
+    def extend(self, records):
+        records = list(records)
+        self._records.extend(records)
+        self.total += len(records)
+
+    def clear(self):
+        self._records.clear()
+        self.total = 0
+
+    def records(self, tags=None):
+        """Iterates the buffered records, oldest first, keeping only ``tags``."""
+        if tags is None:
+            return iter(self._records)
+        tags = set(tags)
+        return (r for r in self._records if filter_tag(r) in tags)
+
+    def tail(self, tags=None, limit=None):
+        """Returns the newest ``limit`` records matching ``tags``, oldest first."""
+        if limit is None:
+            return list(self.records(tags))
+        tags = set(tags) if tags is not None else None
+        out = []
+        for r in reversed(self._records):
+            if tags is None or filter_tag(r) in tags:
+                out.append(r)
+                if len(out) >= limit:
+                    break
+        out.reverse()
+        return out
+
+    def export(self, path, tags=None):
+        """Writes the buffered records as text lines; returns how many were written."""
+        count = 0
+        with open(path, "w") as f:
+            if self.dropped:
+                f.write(f"# {self.dropped} earlier records were dropped (capacity {self.capacity})\n")
+            for record in self.records(tags):
+                for text, _ in render(record):
+                    f.write(text + "\n")
+                count += 1
+        return count
@@ -0,0 +1,254 @@
+"""Counters, latency histograms and gauges for the allocator, in Prometheus format.
+
+Instrumented code checks ``REGISTRY.enabled`` before measuring anything, so
+with metrics disabled (the default) the only cost is that attribute test.
+Metrics are created once at import time by the modules that record them::
+
+    from bankers_metrics import REGISTRY
+
+    REGISTRY.enabled = True
+    ...
+    print(REGISTRY.render())      # Prometheus text exposition format
+
+Histograms use fixed cumulative buckets, so recording is a binary search
+and an increment, and quantiles are estimated from the buckets the same way
+Prometheus' ``histogram_quantile`` does.
+"""
+import bisect
+import math
+import time
+
+# Latency buckets in seconds, from 50 microseconds to 10 seconds
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Buckets for counts such as processes finished per Safety run
+COUNT_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """Monotonic count, one per combination of label values."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+
+    def inc(self, *values, amount=1):
+        self._values[values] = self._values.get(values, 0) + amount
+
+    def value(self, *values):
+        return self._values.get(values, 0)
+
+    def samples(self):
+        for values, count in sorted(self._values.items()):
+            yield self.name + _labels(self.labels, values), count
+
+    def reset(self):
+        self._values.clear()
+
+
+class Histogram:
+    """Distribution of observed values over fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS, labels=()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        self._series = {}
+
+    def observe(self, value, *values):
+        series = self._series.get(values)
+        if series is None:
+            # Per-bucket counts (the last one is +Inf), then sum and count
+            series = self._series[values] = [[0] * (len(self.buckets) + 1), 0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *values):
+        series = self._series.get(values)
+        return series[2] if series else 0
+
+    def mean(self, *values):
+        series = self._series.get(values)
+        return series[1] / series[2] if series else None
+
+    def quantile(self, q, *values):
+        """Estimates the ``q`` quantile by interpolating inside its bucket."""
+        series = self._series.get(values)
+        if not series:
+            return None
+        counts, _, total = series
+        rank = q * total
+        seen = 0
+        for i, c in enumerate(counts):
+            if seen + c >= rank and c:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                low = self.buckets[i - 1] if i else 0
+                return low + (self.buckets[i] - low) * (rank - seen) / c
+            seen += c
+        return self.buckets[-1]
+
+    def series(self):
+        """Label values of every series observed so far."""
+        return sorted(self._series)
+
+    def samples(self):
+        for values in self.series():
+            counts, total, count = self._series[values]
+            running = 0
+            for bound, c in zip(self.buckets + (math.inf,), counts):
+                running += c
+                yield self.name + "_bucket" + _labels(self.labels, values, ("le", _number(bound))), running
+            yield self.name + "_sum" + _labels(self.labels, values), total
+            yield self.name + "_count" + _labels(self.labels, values), count
+
+    def reset(self):
+        self._series.clear()
+
+
+class Gauge:
+    """Value read from a callback at scrape time, e.g. a queue length."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, read):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def samples(self):
+        yield self.name, self.read()
+
+    def reset(self):
+        pass
+
+
+class _Timer:
+    __slots__ = ("histogram", "values", "start")
+
+    def __init__(self, histogram, values):
+        self.histogram = histogram
+        self.values = values
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.values)
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_TIMER = _NoTimer()
+
+
+class Registry:
+    """Named metrics plus the ``enabled`` switch checked by instrumented code."""
+
+    def __init__(self):
+        self.enabled = False
+        self._metrics = {}
+
+    def _add(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if existing.kind != metric.kind:
+                raise ValueError(f"Metric {metric.name} is already a {existing.kind}")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self._add(Counter(name, help, labels))
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS, labels=()):
+        return self._add(Histogram(name, help, buckets, labels))
+
+    def gauge(self, name, help, read):
+        """Registers (or replaces) a gauge read from ``read()`` at scrape time."""
+        self._metrics.pop(name, None)
+        return self._add(Gauge(name, help, read))
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def timer(self, histogram, *values):
+        """Context manager observing its duration in ``histogram``; free when disabled."""
+        return _Timer(histogram, values) if self.enabled else _NO_TIMER
+
+    def reset(self):
+        """Zeroes every counter and histogram."""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Human-readable lines for counters, gauges and histogram percentiles."""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            if isinstance(metric, Histogram):
+                latency = metric.buckets is LATENCY_BUCKETS
+                for values in metric.series():
+                    label = name + _labels(metric.labels, values)
+                    stats = [f"n={metric.count(*values)}"]
+                    for title, v in (("mean", metric.mean(*values)),
+                                     ("p50", metric.quantile(0.5, *values)),
+                                     ("p90", metric.quantile(0.9, *values)),
+                                     ("p99", metric.quantile(0.99, *values))):
+                        stats.append(f"{title}={v * 1000:.3f}ms" if latency else f"{title}={v:.1f}")
+                    lines.append(f"{label}: {' '.join(stats)}")
+            else:
+                for sample, value in metric.samples():
+                    lines.append(f"{sample}: {_number(value)}")
+        return lines
+
+
+# Process-wide registry used by the allocator, the server and the GUI
+REGISTRY = Registry()
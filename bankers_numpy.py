@@ -0,0 +1,226 @@
+"""NumPy-backed Banker's Algorithm engine.
+
+Stores Allocation/Max/Need as contiguous integer arrays and runs the Safety
+algorithm in vectorized rounds: every process that can run with the current
+Work is found with one ``(need <= work).all(axis=1)`` pass and released in
+bulk. ``request_batch`` evaluates many candidate requests against the same
+state at once with matrix operations.
+
+Requires NumPy; the pure-Python engine in ``bankers_engine`` does not.
+"""
+import numpy as np
+
+from bankers_engine import (
+    DENIED, GRANTED, WAIT, BankersError, BankersState,
+    RequestResult, SafetyResult,
+)
+
+DTYPE = np.int64
+
+# Upper bound on elements of the (K, n, m) comparison built per batch chunk
+BATCH_ELEMENTS = 1 << 22
+
+
+def _as_int_array(values):
+    # Signed integer arrays (e.g. int32 views of a mapped file) are used as is
+    arr = np.asarray(values)
+    if arr.dtype.kind == "i" and arr.flags.c_contiguous:
+        return arr
+    return np.ascontiguousarray(arr, dtype=DTYPE)
+
+
+class ArrayState:
+    """Allocation, Max and Available held as NumPy arrays.
+
+    Signed integer arrays are kept without copying; anything else is
+    converted to int64. Work vectors are always accumulated in int64.
+    """
+
+    def __init__(self, allocation, maximum, available):
+        alloc = _as_int_array(allocation)
+        max_mat = _as_int_array(maximum)
+        avail = _as_int_array(available)
+        m = avail.shape[0]
+        if alloc.size == 0:
+            alloc = alloc.reshape(len(alloc), m)
+            max_mat = max_mat.reshape(len(max_mat), m)
+
+        if alloc.ndim != 2 or alloc.shape[1] != m:
+            raise BankersError(f"Allocation must be an n x {m} matrix.")
+        if max_mat.shape != alloc.shape:
+            raise BankersError("Allocation and Max must have the same shape.")
+        if (avail < 0).any():
+            raise BankersError("Available cannot be negative.")
+        if (alloc < 0).any() or (max_mat < 0).any():
+            bad = int(np.flatnonzero(((alloc < 0) | (max_mat < 0)).any(axis=1))[0])
+            raise BankersError(f"P{bad}: values cannot be negative.")
+        need = max_mat - alloc
+        if (need < 0).any():
+            bad = int(np.flatnonzero((need < 0).any(axis=1))[0])
+            raise BankersError(f"P{bad}: Allocation cannot exceed Max!")
+
+        self.allocation = alloc
+        self.maximum = max_mat
+        self.available = avail
+        self.need = need
+        self.n, self.m = alloc.shape
+
+    @classmethod
+    def from_state(cls, state):
+        """Builds an ArrayState from a :class:`bankers_engine.BankersState`."""
+        arr = cls.__new__(cls)
+        arr.allocation = np.array(state.allocation, dtype=DTYPE).reshape(state.n, state.m)
+        arr.maximum = np.array(state.maximum, dtype=DTYPE).reshape(state.n, state.m)
+        arr.available = np.array(state.available, dtype=DTYPE)
+        arr.need = arr.maximum - arr.allocation
+        arr.n, arr.m = state.n, state.m
+        return arr
+
+    def to_state(self):
+        """Converts back to a pure-Python :class:`bankers_engine.BankersState`."""
+        return BankersState._from_parts(
+            self.allocation.tolist(), self.maximum.tolist(),
+            self.available.tolist(), self.need.tolist(),
+        )
+
+    def __repr__(self):
+        return f"ArrayState(n={self.n}, m={self.m}, available={self.available.tolist()})"
+
+
+def safety_check(state):
+    """Runs the Safety algorithm in vectorized rounds.
+
+    Processes that become runnable in the same round are released together,
+    ordered by index within the round.
+    """
+    work = state.available.astype(DTYPE)
+    pending = np.arange(state.n)
+    need = state.need
+    alloc = state.allocation
+    sequence = []
+
+    while pending.size:
+        runnable = (need[pending] <= work).all(axis=1)
+        done = pending[runnable]
+        if done.size == 0:
+            break
+        work += alloc[done].sum(axis=0)
+        sequence.extend(done.tolist())
+        pending = pending[~runnable]
+
+    return SafetyResult(pending.size == 0, sequence, work.tolist())
+
+
+def safe_sequence(state):
+    """Returns a safe sequence of process indices, or None if unsafe."""
+    result = safety_check(state)
+    return result.sequence if result.safe else None
+
+
+def is_safe(state):
+    """Returns True if every process can finish from the given state."""
+    return safety_check(state).safe
+
+
+def provisional_state(state, pid, req_vec):
+    """Returns a copy of ``state`` with ``req_vec`` allocated to ``pid``."""
+    req_vec = np.asarray(req_vec, dtype=DTYPE)
+    new = ArrayState.__new__(ArrayState)
+    new.allocation = state.allocation.astype(DTYPE)
+    new.allocation[pid] += req_vec
+    new.maximum = state.maximum
+    new.need = state.need.astype(DTYPE)
+    new.need[pid] -= req_vec
+    new.available = state.available.astype(DTYPE) - req_vec
+    new.n, new.m = state.n, state.m
+    return new
+
+
+def _validate_batch(state, pids, reqs):
+    if reqs.ndim != 2 or reqs.shape[1] != state.m:
+        raise BankersError(f"Requests must be a K x {state.m} matrix.")
+    if pids.shape[0] != reqs.shape[0]:
+        raise BankersError("Expected one process ID per request.")
+    bad = (pids < 0) | (pids >= state.n)
+    if bad.any():
+        raise BankersError(f"Request {int(np.flatnonzero(bad)[0])}: Invalid Process ID")
+    bad = (reqs < 0).any(axis=1)
+    if bad.any():
+        raise BankersError(f"Request {int(np.flatnonzero(bad)[0])}: values cannot be negative.")
+    bad = (reqs > state.need[pids]).any(axis=1)
+    if bad.any():
+        raise BankersError(f"Request {int(np.flatnonzero(bad)[0])}: Request exceeds Need")
+
+
+def request(state, pid, req_vec):
+    """Runs the Resource-Request algorithm; see :func:`bankers_engine.request`."""
+    status = request_batch(state, [pid], [req_vec])[0]
+    if status != GRANTED:
+        return RequestResult(status, None, state)
+    new_state = provisional_state(state, pid, req_vec)
+    return RequestResult(GRANTED, safe_sequence(new_state), new_state)
+
+
+def request_batch(state, pids, requests):
+    """Evaluates K independent requests against the same state.
+
+    ``pids`` has length K and ``requests`` is a K x m matrix. Returns a list
+    of K statuses (GRANTED, DENIED or WAIT), each as if that request alone
+    were made from ``state``. Candidates are checked together: each round
+    compares the shared Need matrix against all K Work vectors at once and
+    patches in the requesting process's reduced Need.
+    """
+    pids = np.asarray(pids, dtype=np.intp).reshape(-1)
+    reqs = np.asarray(requests, dtype=DTYPE).reshape(len(pids), state.m)
+    _validate_batch(state, pids, reqs)
+
+    k = len(pids)
+    statuses = np.full(k, DENIED, dtype=object)
+    waiting = (reqs > state.available).any(axis=1)
+    statuses[waiting] = WAIT
+
+    candidates = np.flatnonzero(~waiting)
+    chunk = max(1, BATCH_ELEMENTS // max(1, state.n * state.m))
+    for start in range(0, len(candidates), chunk):
+        idx = candidates[start:start + chunk]
+        safe = _batch_safety(state, pids[idx], reqs[idx])
+        statuses[idx[safe]] = GRANTED
+    return statuses.tolist()
+
+
+def _batch_safety(state, pids, reqs):
+    # Returns a boolean array: is the state safe after granting reqs[c] to pids[c]?
+    c = len(pids)
+    need = state.need
+    own_need = need[pids] - reqs
+
+    work = state.available - reqs
+    finished = np.zeros((c, state.n), dtype=bool)
+    active = np.ones(c, dtype=bool)
+    safe = np.zeros(c, dtype=bool)
+
+    while active.any():
+        act = np.flatnonzero(active)
+        w = work[act]
+        runnable = (need[None, :, :] <= w[:, None, :]).all(axis=2)
+        runnable[np.arange(len(act)), pids[act]] = (own_need[act] <= w).all(axis=1)
+        runnable &= ~finished[act]
+
+        progressed = runnable.any(axis=1)
+        # Candidates that made no progress are stuck: unsafe
+        active[act[~progressed]] = False
+        act, runnable = act[progressed], runnable[progressed]
+        if act.size == 0:
+            break
+
+        gained = runnable.astype(DTYPE) @ state.allocation
+        own_done = runnable[np.arange(len(act)), pids[act]]
+        gained[own_done] += reqs[act[own_done]]
+        work[act] += gained
+        finished[act] |= runnable
+
+        complete = finished[act].all(axis=1)
+        safe[act[complete]] = True
+        active[act[complete]] = False
+
+    return safe
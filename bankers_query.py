@@ -0,0 +1,112 @@
+"""How much more can a process be granted? Maximum-grant and headroom queries.
+
+Granting less is never less safe: if granting ``x`` units of resource j to
+a process leaves a safe sequence, the same sequence works for any smaller
+grant. So the largest safe grant can be found by binary search, with one
+safety check per halving instead of one per candidate value.
+
+The current safe sequence already gives a lower bound without any check.
+Granting ``x`` to the process at position k only lowers Work at steps 0..k,
+so the grant is safe if every earlier process still fits. ``x`` up to the
+minimum slack ``Work[j] - Need[j]`` over those steps (and up to Available)
+is therefore safe. :func:`headroom` computes that bound for the whole table
+in one pass over the sequence, and refines it by binary search only when
+asked to and only where it is below the upper bound ``min(Need, Available)``.
+
+Queries take a :class:`bankers_engine.BankersState` or a
+:class:`bankers_allocator.BankersAllocator`, whose cached proof is reused.
+"""
+from bankers_allocator import BankersAllocator
+from bankers_engine import BankersError, provisional_state, safety_check
+
+
+def _proof(source):
+    # Returns (state, safe, [(pid, work_before), ...]) for the current state
+    if isinstance(source, BankersAllocator):
+        result = source.check()
+        return source.state, result.safe, [(p, before) for p, before, _ in source.steps()]
+    steps = []
+    result = safety_check(source, on_step=lambda p, before, after: steps.append((p, before)))
+    return source, result.safe, steps
+
+
+def _slack_bounds(state, steps, pids=None):
+    # Safe grant per (pid, resource) from the prefix-minimum slack of the sequence
+    need = state.need
+    low = state.available[:]
+    wanted = None if pids is None else set(pids)
+    bounds = {}
+    for p, work in steps:
+        row = need[p]
+        if wanted is None or p in wanted:
+            bounds[p] = [min(a, b) for a, b in zip(low, row)]
+        for j in range(state.m):
+            slack = work[j] - row[j]
+            if slack < low[j]:
+                low[j] = slack
+    return bounds
+
+
+def _search(state, pid, j, lo, hi):
+    # Largest safe grant in [lo, hi], given that ``lo`` is known to be safe
+    vec = [0] * state.m
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        vec[j] = mid
+        if safety_check(provisional_state(state, pid, vec)).safe:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _validate(state, pid, j=0):
+    if not 0 <= pid < state.n:
+        raise BankersError("Invalid Process ID")
+    if not 0 <= j < state.m:
+        raise BankersError(f"Resource R{j} does not exist.")
+
+
+def max_grant(source, pid, j):
+    """Returns the largest amount of resource ``j`` that ``pid`` can be granted safely.
+
+    Returns 0 if the state is already unsafe, since no grant can make it safe.
+    """
+    state, safe, steps = _proof(source)
+    _validate(state, pid, j)
+    if not safe:
+        return 0
+    hi = min(state.need[pid][j], state.available[j])
+    lo = _slack_bounds(state, steps, [pid])[pid][j]
+    return _search(state, pid, j, lo, hi)
+
+
+def headroom(source, pids=None, exact=False):
+    """Returns ``{pid: [max safe grant per resource]}`` for ``pids`` (default: all).
+
+    Without ``exact`` the values are the slack bounds: always safe, found
+    with no safety checks beyond the current proof, and exact for every
+    resource where the bound already reaches ``min(Need, Available)``.
+    With ``exact`` the remaining cells are refined by binary search.
+    An unsafe state has no headroom.
+    """
+    state, safe, steps = _proof(source)
+    if pids is None:
+        pids = range(state.n)
+    pids = list(pids)
+    for pid in pids:
+        _validate(state, pid)
+    if not safe:
+        return {pid: [0] * state.m for pid in pids}
+
+    bounds = _slack_bounds(state, steps, pids)
+    if exact:
+        avail = state.available
+        for pid in pids:
+            row = bounds[pid]
+            need = state.need[pid]
+            for j in range(state.m):
+                hi = min(need[j], avail[j])
+                if row[j] < hi:
+                    row[j] = _search(state, pid, j, row[j], hi)
+    return {pid: bounds[pid] for pid in pids}
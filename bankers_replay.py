@@ -0,0 +1,225 @@
+"""Streaming replay of a time-ordered allocation event log.
+
+Events are JSON lines read from a file or stdin; ``t`` is optional and
+echoed back, ``pid`` is any process name::
+
+    {"event": "init", "available": [10, 5, 7]}
+    {"event": "arrive", "pid": "web-1", "max": [7, 5, 3]}
+    {"event": "allocate", "pid": "web-1", "vector": [0, 1, 0]}
+    {"event": "request", "pid": "web-1", "vector": [1, 0, 2], "t": 12.5}
+    {"event": "release", "pid": "web-1", "vector": [1, 0, 0]}
+    {"event": "exit", "pid": "web-1"}
+
+``allocate`` records an allocation that already happened, without the
+safety test; ``request`` runs the Resource-Request algorithm. A request
+that must wait is parked (one per process; a newer request replaces it)
+and decided again when a release lets it fit.
+
+The pipeline is a chain of generators over one incremental
+:class:`bankers_allocator.BankersAllocator`, so memory depends on the
+number of live processes, not on the length of the trace. IDs of exited
+processes are reused. One JSON record is written per decision, plus an
+``alert`` record whenever the state turns unsafe or becomes safe again::
+
+    python bankers_replay.py trace.jsonl > decisions.jsonl
+    zcat trace.jsonl.gz | python bankers_replay.py - --alerts-only
+"""
+import argparse
+import json
+import sys
+
+from bankers_allocator import BankersAllocator
+from bankers_engine import WAIT, BankersError, BankersState, to_int
+from bankers_waitqueue import FIFO, POLICIES, WaitQueue
+
+
+def read_events(lines):
+    """Parses JSON lines into ``(line_number, event)`` pairs.
+
+    Lines that are not JSON objects yield an ``{"event": None, "error": ...}``
+    event so the replay can report them and carry on.
+    """
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            event = json.loads(line)
+            if not isinstance(event, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as exc:
+            event = {"event": None, "error": f"Bad JSON: {exc}"}
+        yield lineno, event
+
+
+class Replayer:
+    """Applies events one at a time and returns the records they produce."""
+
+    def __init__(self, policy=FIFO, cache_size=1024):
+        self.policy = policy
+        self.cache_size = cache_size
+        self.allocator = None
+        self.waiting = None
+        self.safe = True
+        self._ids = {}
+        self._names = {}
+        self._pending = {}
+
+    def _pid(self, name):
+        try:
+            return self._ids[name]
+        except (KeyError, TypeError):
+            raise BankersError(f"Unknown process {name!r}") from None
+
+    def _vector(self, event, key="vector"):
+        # Whole numbers only: 0.7 must not replay as a zero request
+        return [to_int(v) for v in event[key]]
+
+    def feed(self, lineno, event):
+        """Applies one event; returns a list of output records."""
+        out = []
+        base = {"line": lineno}
+        if "t" in event:
+            base["t"] = event["t"]
+        try:
+            kind = event.get("event")
+            if "error" in event and kind is None:
+                raise BankersError(event["error"])
+            if kind == "init":
+                self._init(event)
+            elif self.allocator is None:
+                raise BankersError("The first event must be 'init'.")
+            elif kind == "arrive":
+                self._arrive(event)
+                self._check(out, base, may_break=True)
+            elif kind == "allocate":
+                self.allocator.allocate(self._pid(event["pid"]), self._vector(event))
+                self._check(out, base, may_break=True)
+            elif kind == "request":
+                self._request(event, out, base)
+            elif kind == "release":
+                vector = self._vector(event)
+                self.allocator.release(self._pid(event["pid"]), vector)
+                self._wake(vector, out, base)
+                self._check(out, base, may_break=False)
+            elif kind == "exit":
+                self._exit(event, out, base)
+                self._check(out, base, may_break=False)
+            else:
+                raise BankersError(f"Unknown event {kind!r}")
+        except (BankersError, KeyError, TypeError, ValueError) as exc:
+            out.append(dict(base, error=str(exc)))
+        return out
+
+    def _init(self, event):
+        available = self._vector(event, "available")
+        self.allocator = BankersAllocator(BankersState([], [], available), self.cache_size)
+        self.waiting = WaitQueue(len(available), self.policy)
+        self.safe = True
+        self._ids.clear()
+        self._names.clear()
+        self._pending.clear()
+
+    def _arrive(self, event):
+        name = event["pid"]
+        if name in self._ids:
+            raise BankersError(f"Process {name!r} already exists")
+        pid = self.allocator.add_process(self._vector(event, "max"))
+        self._ids[name] = pid
+        self._names[pid] = name
+
+    def _request(self, event, out, base):
+        name = event["pid"]
+        pid = self._pid(name)
+        vector = self._vector(event)
+        result = self.allocator.request(pid, vector)
+        old = self._pending.pop(pid, None)
+        if old is not None:
+            self.waiting.cancel(old)
+        if result.status == WAIT:
+            self._pending[pid] = self.waiting.add(pid, vector, self.allocator.state.available, event.get("t"))
+        out.append(dict(base, pid=name, decision=result.status))
+
+    def _exit(self, event, out, base):
+        name = event["pid"]
+        pid = self._pid(name)
+        old = self._pending.pop(pid, None)
+        if old is not None:
+            self.waiting.cancel(old)
+        held = self.allocator.state.allocation[pid][:]
+        self.allocator.remove_process(pid)
+        del self._ids[name]
+        del self._names[pid]
+        self._wake(held, out, base)
+
+    def _wake(self, released, out, base):
+        # Decides the parked requests that fit after a release
+        if not any(released) or not len(self.waiting):
+            return
+        allocator = self.allocator
+        for waiter in self.waiting.on_release(released, allocator.state.available):
+            pid = waiter.pid
+            try:
+                result = allocator.request(pid, waiter.vector)
+            except BankersError as exc:
+                del self._pending[pid]
+                out.append(dict(base, pid=self._names[pid], error=str(exc), woken=True))
+                continue
+            if result.status == WAIT:
+                self.waiting.requeue(waiter, allocator.state.available)
+                continue
+            del self._pending[pid]
+            record = dict(base, pid=self._names[pid], decision=result.status, woken=True)
+            if waiter.payload is not None:
+                record["since"] = waiter.payload
+            out.append(record)
+
+    def _check(self, out, base, may_break):
+        # Events that add claims can only break a safe state and releases can
+        # only fix an unsafe one, so the check runs only when the verdict can
+        # actually change
+        if self.safe != may_break:
+            return
+        safe = self.allocator.check().safe
+        if safe != self.safe:
+            self.safe = safe
+            out.append(dict(base, alert="safe" if safe else "unsafe"))
+
+
+def replay(events, policy=FIFO, cache_size=1024):
+    """Yields output records for a stream of ``(line_number, event)`` pairs."""
+    replayer = Replayer(policy, cache_size)
+    for lineno, event in events:
+        yield from replayer.feed(lineno, event)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a Banker's allocation event log")
+    parser.add_argument("input", help="JSON-lines event log, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="decision file (default: stdout)")
+    parser.add_argument("--fairness", choices=POLICIES, default=FIFO,
+                        help="order in which woken requests are decided")
+    parser.add_argument("--alerts-only", action="store_true", help="only write alerts and errors")
+    args = parser.parse_args(argv)
+
+    try:
+        src = sys.stdin if args.input == "-" else open(args.input)
+        out = sys.stdout if args.output == "-" else open(args.output, "w")
+    except OSError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    try:
+        for record in replay(read_events(src), args.fairness):
+            if args.alerts_only and "alert" not in record and "error" not in record:
+                continue
+            out.write(json.dumps(record) + "\n")
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""Asyncio admission server around the Banker's Resource-Request algorithm.
+
+One :class:`bankers_allocator.BankersAllocator` is owned by a single writer
+task. Clients send newline-delimited JSON messages over TCP or a Unix
+socket; every message is queued to the writer, which drains whatever has
+piled up in one go and retries parked requests once per burst instead of
+once per release.
+
+Messages (``id`` is optional and echoed back in the reply)::
+
+    {"op": "request", "pid": 1, "vector": [1, 0, 2], "id": 7}
+    {"op": "release", "pid": 1, "vector": [1, 0, 2]}
+    {"op": "state"}
+    {"op": "max_grant", "pid": 1, "resource": 2}
+    {"op": "headroom", "pids": [0, 1], "exact": false}
+    {"op": "metrics"}
+
+A request that exceeds Available is parked in a
+:class:`bankers_waitqueue.WaitQueue` instead of answered with "wait"; its
+reply is sent once a release lets it be granted or denied. Only requests
+that fit after a release are re-evaluated, in FIFO or smallest-request-first
+order. Send ``"park": false`` to get the "wait" status back immediately.
+
+Run as ``python bankers_server.py state.json --port 7070`` or with
+``--unix /path/to/socket``; ``state.json`` holds ``allocation``, ``max``
+and ``available``. ``--metrics-port 9100`` turns on instrumentation and
+serves it at ``http://host:9100/metrics`` in the Prometheus text format;
+``--metrics`` turns it on for the ``metrics`` op only.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from bankers_allocator import BankersAllocator
+from bankers_engine import WAIT, BankersError, BankersState, to_int
+from bankers_metrics import REGISTRY
+from bankers_query import headroom, max_grant
+from bankers_waitqueue import FIFO, POLICIES, WaitQueue
+
+# Most messages the writer takes from the queue before retrying parked requests
+MAX_BATCH = 256
+
+
+class BankersServer:
+    """Serializes all state changes through one writer task."""
+
+    def __init__(self, allocator, max_batch=MAX_BATCH, policy=FIFO):
+        self.allocator = allocator
+        self.max_batch = max_batch
+        self.waiting = WaitQueue(allocator.state.m, policy)
+        self._queue = asyncio.Queue()
+        self._writer_task = None
+        REGISTRY.gauge("bankers_waiting_requests", "Requests parked until a release lets them fit.",
+                       lambda: len(self.waiting))
+
+    async def start(self):
+        """Starts the writer task; called by the ``serve_*`` helpers."""
+        if self._writer_task is None:
+            self._writer_task = asyncio.ensure_future(self._writer())
+
+    async def stop(self):
+        """Stops the writer and cancels parked requests."""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        self.waiting.clear()
+
+    async def submit(self, message):
+        """Queues one message for the writer and waits for its reply."""
+        return await (await self._enqueue(message))
+
+    async def _enqueue(self, message):
+        # Returns the future of the reply; a None message is a barrier, answered
+        # once every message queued before it has been handled
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((message, fut))
+        return fut
+
+    async def _writer(self):
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            released = [0] * self.allocator.state.m
+            for message, fut in batch:
+                if fut.cancelled():
+                    continue
+                if message is None:
+                    fut.set_result(None)
+                    continue
+                try:
+                    self._handle(message, fut, released)
+                except BankersError as exc:
+                    error = str(exc)
+                except (KeyError, TypeError, ValueError, OverflowError) as exc:
+                    error = f"Malformed message: {exc}"
+                except Exception as exc:
+                    # Nothing a client sends may stop the writer
+                    error = f"Internal error: {exc!r}"
+                else:
+                    continue
+                if not fut.done():
+                    fut.set_result(_reply(message, status="error", error=error))
+            if any(released) and len(self.waiting):
+                self._wake(released)
+
+    def _handle(self, message, fut, released):
+        # Applies one message, marking released resources in ``released``
+        op = message.get("op")
+        allocator = self.allocator
+        if op == "request":
+            pid = to_int(message["pid"])
+            vector = [to_int(v) for v in message["vector"]]
+            result = allocator.request(pid, vector)
+            if result.status == WAIT and message.get("park", True):
+                waiter = self.waiting.add(pid, vector, allocator.state.available, (message, fut))
+                fut.add_done_callback(lambda f: f.cancelled() and self.waiting.cancel(waiter))
+            else:
+                fut.set_result(_reply(message, status=result.status, sequence=result.sequence))
+        elif op == "release":
+            vector = [to_int(v) for v in message["vector"]]
+            allocator.release(to_int(message["pid"]), vector)
+            for j, v in enumerate(vector):
+                if v:
+                    released[j] = 1
+            fut.set_result(_reply(message, status="ok"))
+        elif op == "state":
+            state = allocator.state
+            fut.set_result(_reply(message, status="ok", available=state.available[:],
+                                  allocation=[row[:] for row in state.allocation],
+                                  waiting=len(self.waiting)))
+        elif op == "max_grant":
+            amount = max_grant(allocator, to_int(message["pid"]), to_int(message["resource"]))
+            fut.set_result(_reply(message, status="ok", amount=amount))
+        elif op == "headroom":
+            pids = message.get("pids")
+            rows = headroom(allocator, None if pids is None else [to_int(p) for p in pids],
+                            exact=bool(message.get("exact", False)))
+            fut.set_result(_reply(message, status="ok", headroom=rows))
+        elif op == "metrics":
+            fut.set_result(_reply(message, status="ok", metrics=REGISTRY.render()))
+        else:
+            raise BankersError(f"Unknown op {op!r}")
+
+    def _wake(self, released):
+        # Re-evaluates only the parked requests that fit after the releases
+        allocator = self.allocator
+        for waiter in self.waiting.on_release(released, allocator.state.available):
+            message, fut = waiter.payload
+            if fut.done():
+                continue
+            try:
+                result = allocator.request(waiter.pid, waiter.vector)
+            except Exception as exc:
+                fut.set_result(_reply(message, status="error", error=str(exc)))
+                continue
+            if result.status == WAIT:
+                self.waiting.requeue(waiter, allocator.state.available)
+            else:
+                fut.set_result(_reply(message, status=result.status, sequence=result.sequence))
+
+    async def handle_client(self, reader, writer):
+        """Serves one connection; replies may arrive out of order, matched by ``id``."""
+        lock = asyncio.Lock()
+        pending = {}
+
+        async def answer(fut):
+            reply = await fut
+            async with lock:
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as exc:
+                    async with lock:
+                        writer.write(json.dumps({"status": "error", "error": f"Bad JSON: {exc}"}).encode() + b"\n")
+                    continue
+                fut = await self._enqueue(message)
+                task = asyncio.ensure_future(answer(fut))
+                pending[task] = fut
+                task.add_done_callback(lambda t: pending.pop(t, None))
+        except ConnectionError:
+            pass
+        finally:
+            await self._finish_client(pending)
+            writer.close()
+
+    async def _finish_client(self, pending):
+        # Lets the writer handle everything the client sent, then drops only the
+        # requests still parked (a gone client must not be granted later) and
+        # waits for the other replies to be written
+        if not pending:
+            return
+        if self._writer_task is not None and not self._writer_task.done():
+            await (await self._enqueue(None))
+        for fut in list(pending.values()):
+            if not fut.done():
+                fut.cancel()
+        await asyncio.gather(*list(pending), return_exceptions=True)
+
+    async def serve_tcp(self, host="127.0.0.1", port=7070):
+        """Starts listening on TCP and returns the asyncio server."""
+        await self.start()
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def serve_unix(self, path):
+        """Starts listening on a Unix socket and returns the asyncio server."""
+        await self.start()
+        return await asyncio.start_unix_server(self.handle_client, path)
+
+    async def serve_metrics(self, host="127.0.0.1", port=9100):
+        """Serves ``GET /metrics`` over HTTP for Prometheus and returns the asyncio server."""
+        return await asyncio.start_server(_metrics_client, host, port)
+
+
+async def _metrics_client(reader, writer):
+    # Minimal HTTP/1.0: one GET per connection, headers ignored
+    try:
+        request = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request.split()
+        if len(parts) >= 2 and parts[0] == b"GET" and parts[1].split(b"?")[0] == b"/metrics":
+            status, body = "200 OK", REGISTRY.render().encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            status, body, content_type = "404 Not Found", b"Not Found\n", "text/plain"
+        writer.write(f"HTTP/1.0 {status}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def _reply(message, **fields):
+    if "id" in message:
+        fields["id"] = message["id"]
+    return fields
+
+
+async def _serve(args):
+    with open(args.state) as f:
+        state = BankersState.from_dict(json.load(f))
+    server = BankersServer(BankersAllocator(state, cache_size=args.cache_size),
+                           policy=args.fairness)
+    if args.unix:
+        listener = await server.serve_unix(args.unix)
+        where = args.unix
+    else:
+        listener = await server.serve_tcp(args.host, args.port)
+        where = f"{args.host}:{args.port}"
+    print(f"Banker's admission server listening on {where}", file=sys.stderr)
+    if args.metrics_port is not None:
+        await server.serve_metrics(args.host, args.metrics_port)
+        print(f"Metrics at http://{args.host}:{args.metrics_port}/metrics", file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banker's Algorithm admission server")
+    parser.add_argument("state", help="JSON file with allocation, max and available")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7070)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--fairness", choices=POLICIES, default=FIFO,
+                        help="order in which woken requests are re-evaluated")
+    parser.add_argument("--metrics", action="store_true",
+                        help="collect timings and counters (served by the metrics op)")
+    parser.add_argument("--metrics-port", type=int,
+                        help="also serve the metrics over HTTP on this port (implies --metrics)")
+    args = parser.parse_args(argv)
+    if args.metrics or args.metrics_port is not None:
+        REGISTRY.enabled = True
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    except (OSError, BankersError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
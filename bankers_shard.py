@@ -0,0 +1,331 @@
+"""Banker's allocator partitioned into shards with a few shared global resources.
+
+Every shard (e.g. one cluster) owns its process table and its local
+resource pools, and runs in its own worker process. The last ``globals``
+columns of every shard's state are the shared global resources. Their free
+units are split into per-shard quotas: a shard's Available for a global
+column is the quota it currently holds.
+
+Each shard checks safety against its own local pools and its quota only.
+Quotas are disjoint, so if every shard is safe, the whole system is safe
+(run the shards' safe sequences one after another). Requests that stay
+within the shard's quota are therefore decided by that shard alone, in
+parallel with every other shard.
+
+Coordination happens only when a request needs more of a global resource
+than its shard holds. The coordinator then borrows free quota from other
+shards. A donor gives only its *spare* units: the smallest slack
+``Work[j] - Need[j]`` along its current safe sequence. Lowering Available by
+that much keeps the same sequence valid, so a donor never becomes unsafe.
+The request is validated before anything is borrowed, and borrowed units
+go back to their donors unless it is granted. If the spare units are not
+enough, the request waits::
+
+    with ShardedAllocator([state_a, state_b], globals=1) as pool:
+        pool.request(0, 3, [1, 0, 2])        # shard 0, process 3
+        pool.request_many([(0, 1, v1), (1, 4, v2), ...])
+"""
+import multiprocessing
+import pickle
+
+from bankers_allocator import BankersAllocator
+from bankers_engine import GRANTED, WAIT, BankersError, validate_request
+
+
+class Shard:
+    """One shard's allocator; runs inside a worker process, or in-process."""
+
+    def __init__(self, state, globals, cache_size=1024):
+        self.allocator = BankersAllocator(state, cache_size)
+        self.global_cols = list(range(state.m - globals, state.m))
+
+    def request(self, pid, vec):
+        """Returns ``(status, sequence)``; the new state stays in the shard."""
+        result = self.allocator.request(pid, vec)
+        return result.status, result.sequence
+
+    def requests(self, items):
+        """Decides ``[(pid, vector), ...]`` in order; errors come back as ``"error: ..."``."""
+        out = []
+        for pid, vec in items:
+            try:
+                out.append(self.allocator.request(pid, vec).status)
+            except Exception as exc:
+                out.append(f"error: {exc}")
+        return out
+
+    def release(self, pid, vec):
+        self.allocator.release(pid, vec)
+
+    def check(self):
+        return self.allocator.check()
+
+    def quota(self):
+        """Free units of each global resource held by this shard."""
+        avail = self.allocator.state.available
+        return [avail[j] for j in self.global_cols]
+
+    def shortfall(self, pid, vec):
+        """Validates a request; returns the global units it needs beyond the quota."""
+        validate_request(self.allocator.state, pid, vec)
+        return [max(0, vec[j] - q) for j, q in zip(self.global_cols, self.quota())]
+
+    def spare(self):
+        """Global units that can be given away without making this shard unsafe."""
+        allocator = self.allocator
+        if not allocator.check().safe:
+            return [0] * len(self.global_cols)
+        need = allocator.state.need
+        spare = self.quota()
+        for p, work, _ in allocator.steps():
+            row = need[p]
+            for k, j in enumerate(self.global_cols):
+                slack = work[j] - row[j]
+                if slack < spare[k]:
+                    spare[k] = slack
+        return spare
+
+    def adjust(self, deltas):
+        """Adds ``deltas`` (one per global resource) to this shard's quota."""
+        avail = self.allocator.state.available[:]
+        for j, d in zip(self.global_cols, deltas):
+            avail[j] += d
+        self.allocator.set_available(avail)
+
+
+def _failure(exc):
+    # Exceptions travel back to the parent; ones that do not pickle become BankersError
+    try:
+        pickle.dumps(exc)
+    except Exception:
+        return BankersError(f"{type(exc).__name__}: {exc}")
+    return exc
+
+
+def _serve(conn, state, globals, cache_size):
+    # Worker process loop: one (method, args) message in, one reply out.
+    # Every error is sent back, so the shard outlives bad calls
+    shard = Shard(state, globals, cache_size)
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        try:
+            op, args = message
+            reply = (True, getattr(shard, op)(*args))
+        except Exception as exc:
+            reply = (False, _failure(exc))
+        conn.send(reply)
+    conn.close()
+
+
+class _RemoteShard:
+    def __init__(self, context, state, globals, cache_size):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child, state, globals, cache_size), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, op, *args):
+        self.conn.send((op, args))
+
+    def recv(self):
+        ok, value = self.conn.recv()
+        if not ok:
+            raise value
+        return value
+
+    def call(self, op, *args):
+        self.send(op, *args)
+        return self.recv()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join()
+        self.conn.close()
+
+
+class _LocalShard:
+    # Same interface as _RemoteShard, evaluated immediately in this process
+    def __init__(self, state, globals, cache_size):
+        self.shard = Shard(state, globals, cache_size)
+        self._pending = None
+
+    def send(self, op, *args):
+        try:
+            self._pending = (True, getattr(self.shard, op)(*args))
+        except Exception as exc:
+            self._pending = (False, exc)
+
+    def recv(self):
+        ok, value = self._pending
+        self._pending = None
+        if not ok:
+            raise value
+        return value
+
+    def call(self, op, *args):
+        return getattr(self.shard, op)(*args)
+
+    def close(self):
+        pass
+
+
+class ShardedAllocator:
+    """Coordinates shards that each own local pools and a quota of global resources.
+
+    ``states`` holds one :class:`bankers_engine.BankersState` per shard; in
+    each, the last ``globals`` columns are the global resources and their
+    Available values are the shard's initial quota. ``workers=False``
+    keeps every shard in this process.
+    """
+
+    def __init__(self, states, globals=0, workers=True, cache_size=1024):
+        for k, state in enumerate(states):
+            if state.m < globals:
+                raise BankersError(f"Shard {k} has fewer than {globals} resource columns.")
+        self.globals = globals
+        self.borrows = 0
+        if workers:
+            context = multiprocessing.get_context()
+            self.shards = [_RemoteShard(context, s, globals, cache_size) for s in states]
+        else:
+            self.shards = [_LocalShard(s, globals, cache_size) for s in states]
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _shard(self, index):
+        if not 0 <= index < len(self.shards):
+            raise BankersError("Invalid Shard ID")
+        return self.shards[index]
+
+    def _global_part(self, vec):
+        return list(vec[len(vec) - self.globals:]) if self.globals else []
+
+    def _borrow(self, index, missing):
+        # Moves spare quota from other shards until ``missing`` is covered;
+        # returns the loans as [(donor, units), ...], or None if they cannot
+        donors = [k for k in range(len(self.shards)) if k != index]
+        for k in donors:
+            self.shards[k].send("spare")
+        spares = [self.shards[k].recv() for k in donors]
+        if any(sum(s[g] for s in spares) < need for g, need in enumerate(missing)):
+            return None
+        self.borrows += 1
+        loans = []
+        gained = [0] * self.globals
+        for k, spare in zip(donors, spares):
+            take = [min(s, need - got) for s, need, got in zip(spare, missing, gained)]
+            if any(take):
+                self.shards[k].call("adjust", [-t for t in take])
+                loans.append((k, take))
+                gained = [a + t for a, t in zip(gained, take)]
+            if gained == missing:
+                break
+        self.shards[index].call("adjust", gained)
+        return loans
+
+    def _repay(self, index, loans):
+        # Gives borrowed units back to their donors; the borrower used none of them
+        self.shards[index].call("adjust", [-sum(t[g] for _, t in loans) for g in range(self.globals)])
+        for k, take in loans:
+            self.shards[k].call("adjust", take)
+
+    def _missing(self, index, pid, vec):
+        # Validates the request in its shard before any quota is moved for it
+        if not self.globals or not any(self._global_part(vec)):
+            return None
+        missing = self.shards[index].call("shortfall", pid, vec)
+        return missing if any(missing) else None
+
+    def request(self, index, pid, vec):
+        """Runs the Resource-Request algorithm in shard ``index``; returns ``(status, sequence)``.
+
+        Borrows global quota from other shards first if the shard's own is
+        too small; returns WAIT when the others cannot spare enough. Borrowed
+        units go back to their donors unless the request is granted.
+        """
+        shard = self._shard(index)
+        vec = list(vec)
+        missing = self._missing(index, pid, vec)
+        if missing is None:
+            return shard.call("request", pid, vec)
+        loans = self._borrow(index, missing)
+        if loans is None:
+            return WAIT, None
+        try:
+            status, sequence = shard.call("request", pid, vec)
+        except Exception:
+            self._repay(index, loans)
+            raise
+        if status != GRANTED:
+            self._repay(index, loans)
+        return status, sequence
+
+    def request_many(self, items):
+        """Decides ``[(shard, pid, vector), ...]``; returns statuses in input order.
+
+        Requests within their shard's quota are sent to all shards at once
+        and decided in parallel, in input order within each shard. Requests
+        that need borrowed quota are decided one by one afterwards.
+        """
+        statuses = [None] * len(items)
+        batches = {}
+        later = []
+        quotas = {}
+        for pos, (index, pid, vec) in enumerate(items):
+            self._shard(index)
+            wanted = self._global_part(vec)
+            if any(wanted):
+                if index not in quotas:
+                    quotas[index] = self.shards[index].call("quota")
+                quota = quotas[index]
+                if any(w > q for w, q in zip(wanted, quota)):
+                    later.append(pos)
+                    continue
+                # Reserve the quota, since earlier requests in the batch may use it
+                quotas[index] = [q - w for q, w in zip(quota, wanted)]
+            batches.setdefault(index, []).append((pos, pid, list(vec)))
+
+        for index, batch in batches.items():
+            self.shards[index].send("requests", [(pid, vec) for _, pid, vec in batch])
+        for index, batch in batches.items():
+            for (pos, _, _), status in zip(batch, self.shards[index].recv()):
+                statuses[pos] = status
+
+        for pos in later:
+            index, pid, vec = items[pos]
+            try:
+                statuses[pos] = self.request(index, pid, vec)[0]
+            except Exception as exc:
+                statuses[pos] = f"error: {exc}"
+        return statuses
+
+    def release(self, index, pid, vec):
+        """Returns resources to shard ``index``; released global units join its quota."""
+        self._shard(index).call("release", pid, list(vec))
+
+    def check(self):
+        """Checks all shards in parallel; returns ``(safe, [SafetyResult per shard])``."""
+        for shard in self.shards:
+            shard.send("check")
+        results = [shard.recv() for shard in self.shards]
+        return all(r.safe for r in results), results
+
+    def quotas(self):
+        """Free units of each global resource held by each shard."""
+        return [shard.call("quota") for shard in self.shards]
@@ -0,0 +1,325 @@
+"""Sparse Banker's Algorithm engine for processes that use few resource types.
+
+Each process keeps its Allocation, Max and Need as ``{resource: value}``
+dicts holding only non-zero entries, and every resource keeps an index
+of the processes that still need it, sorted by amount. The Safety
+algorithm is the one in :mod:`bankers_engine`, except that a process is
+unblocked only through the resources it actually needs, and a finishing
+process only touches the resources it holds. A check therefore costs
+O(nnz log nnz) instead of O(n*m log n), and memory is proportional to the
+non-zero entries.
+
+:func:`load_state` reads a scenario dict whose rows are either dense lists
+or sparse ``{resource: value}`` dicts (JSON object keys are strings), or
+``[[resource, value], ...]`` pair lists. It returns a :class:`SparseState`
+when at most :data:`SPARSE_THRESHOLD` of the cells are non-zero, and a
+dense :class:`bankers_engine.BankersState` otherwise. :func:`engine_for`
+returns the module that implements the algorithms for either kind.
+"""
+import heapq
+import sys
+
+import bankers_engine
+from bankers_engine import (
+    DENIED, GRANTED, WAIT, BankersError, BankersState, RequestResult, SafetyResult, to_int,
+)
+
+# States with at most this fraction of non-zero cells are kept sparse
+SPARSE_THRESHOLD = 0.1
+
+
+def _resource(j):
+    # JSON object keys are strings, so resource IDs may be digit strings
+    if isinstance(j, str) and j.isdigit():
+        return int(j)
+    return to_int(j)
+
+
+def _sparse_row(row, m, i):
+    # Accepts a dense list, a {resource: value} dict or [[resource, value], ...];
+    # an empty list is an empty pair list, i.e. a process that holds nothing
+    if isinstance(row, dict):
+        items = row.items()
+    elif not isinstance(row, (list, tuple)):
+        raise BankersError(f"P{i}: expected a list or an object, got {row!r}.")
+    elif not row or isinstance(row[0], (list, tuple)):
+        items = row
+    else:
+        if len(row) != m:
+            raise BankersError(f"P{i}: expected {m} resource columns.")
+        items = enumerate(row)
+    out = {}
+    for j, v in items:
+        j, v = _resource(j), to_int(v)
+        if not 0 <= j < m:
+            raise BankersError(f"P{i}: resource R{j} does not exist.")
+        if v < 0:
+            raise BankersError(f"P{i}: values cannot be negative.")
+        if v:
+            out[j] = v
+    return out
+
+
+class SparseState:
+    """Allocation, Max and Available with per-process sparse rows.
+
+    ``allocation``, ``maximum`` and ``need`` are lists of ``{resource: value}``
+    dicts without zero entries; ``available`` is a dense list of m values.
+    Rows are treated as immutable, as in :class:`bankers_engine.BankersState`.
+    """
+
+    def __init__(self, allocation, maximum, available):
+        available = [to_int(v) for v in available]
+        m = len(available)
+        n = len(allocation)
+        if len(maximum) != n:
+            raise BankersError("Allocation and Max must have the same number of processes.")
+        if any(v < 0 for v in available):
+            raise BankersError("Available cannot be negative.")
+
+        alloc_rows, max_rows, need_rows = [], [], []
+        for i in range(n):
+            alloc = _sparse_row(allocation[i], m, i)
+            max_row = _sparse_row(maximum[i], m, i)
+            need = dict(max_row)
+            for j, a in alloc.items():
+                left = max_row.get(j, 0) - a
+                if left < 0:
+                    raise BankersError(f"P{i}: Allocation cannot exceed Max!")
+                if left:
+                    need[j] = left
+                else:
+                    del need[j]
+            alloc_rows.append(alloc)
+            max_rows.append(max_row)
+            need_rows.append(need)
+
+        self.allocation = alloc_rows
+        self.maximum = max_rows
+        self.need = need_rows
+        self.available = available
+        self.n = n
+        self.m = m
+
+    @classmethod
+    def _from_parts(cls, allocation, maximum, available, need):
+        state = cls.__new__(cls)
+        state.allocation = allocation
+        state.maximum = maximum
+        state.available = available
+        state.need = need
+        state.n = len(allocation)
+        state.m = len(available)
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        """Converts a dense :class:`bankers_engine.BankersState`."""
+        return cls(state.allocation, state.maximum, state.available)
+
+    def to_state(self):
+        """Expands into a dense :class:`bankers_engine.BankersState`."""
+        m = self.m
+        alloc, max_mat = [], []
+        for a_row, m_row in zip(self.allocation, self.maximum):
+            dense_a = [0] * m
+            dense_m = [0] * m
+            for j, v in a_row.items():
+                dense_a[j] = v
+            for j, v in m_row.items():
+                dense_m[j] = v
+            alloc.append(dense_a)
+            max_mat.append(dense_m)
+        return BankersState(alloc, max_mat, self.available)
+
+    def to_dict(self):
+        """Returns the state with sparse rows, readable by :func:`load_state`."""
+        return {
+            "allocation": [{str(j): v for j, v in row.items()} for row in self.allocation],
+            "max": [{str(j): v for j, v in row.items()} for row in self.maximum],
+            "available": self.available[:],
+        }
+
+    @property
+    def nnz(self):
+        """Number of non-zero Max entries (Allocation is never wider than Max)."""
+        return sum(len(row) for row in self.maximum)
+
+    def __repr__(self):
+        return f"SparseState(n={self.n}, m={self.m}, nnz={self.nnz})"
+
+
+def load_state(data, threshold=SPARSE_THRESHOLD):
+    """Builds a sparse or dense state from a scenario dict, whichever fits the data."""
+    try:
+        allocation, maximum, available = data["allocation"], data["max"], data["available"]
+    except KeyError as exc:
+        raise BankersError(f"Missing field {exc.args[0]!r}.") from None
+    for name, rows in (("allocation", allocation), ("max", maximum), ("available", available)):
+        if not isinstance(rows, list):
+            raise BankersError(f"{name!r} must be a list.")
+    state = SparseState(allocation, maximum, available)
+    cells = state.n * state.m
+    if cells and state.nnz > threshold * cells:
+        return state.to_state()
+    return state
+
+
+def engine_for(state):
+    """Returns the module implementing the algorithms for ``state``'s representation."""
+    return sys.modules[__name__] if isinstance(state, SparseState) else bankers_engine
+
+
+def safety_check(state, on_step=None):
+    """Runs the Safety algorithm on a :class:`SparseState`; see :func:`bankers_engine.safety_check`.
+
+    ``on_step`` receives dense Work vectors, like the dense engine's.
+    """
+    n, m = state.n, state.m
+    need = state.need
+    alloc = state.allocation
+    work = state.available[:]
+
+    columns = [[] for _ in range(m)]
+    blocked = [0] * n
+    for p, row in enumerate(need):
+        blocked[p] = len(row)
+        for j, v in row.items():
+            columns[j].append((v, p))
+    for col in columns:
+        col.sort()
+    ptr = [0] * m
+    ready = [p for p in range(n) if not blocked[p]]
+
+    def advance(j):
+        col = columns[j]
+        w = work[j]
+        k = ptr[j]
+        end = len(col)
+        while k < end and col[k][0] <= w:
+            p = col[k][1]
+            blocked[p] -= 1
+            if blocked[p] == 0:
+                heapq.heappush(ready, p)
+            k += 1
+        ptr[j] = k
+
+    for j in range(m):
+        if columns[j]:
+            advance(j)
+
+    sequence = []
+    while ready:
+        p = heapq.heappop(ready)
+        before = work[:] if on_step else None
+        held = alloc[p]
+        for j, a in held.items():
+            work[j] += a
+        sequence.append(p)
+        if on_step:
+            on_step(p, before, work[:])
+        for j in held:
+            if ptr[j] < len(columns[j]):
+                advance(j)
+
+    return SafetyResult(len(sequence) == n, sequence, work)
+
+
+def safe_sequence(state, on_step=None):
+    """Returns a safe sequence of process indices, or None if unsafe."""
+    result = safety_check(state, on_step)
+    return result.sequence if result.safe else None
+
+
+def is_safe(state):
+    return safety_check(state).safe
+
+
+def _sparse_vector(state, vec, what):
+    # Requests and releases may be dense vectors or {resource: value} dicts
+    if isinstance(vec, dict):
+        items = vec.items()
+    else:
+        vec = list(vec)
+        if len(vec) != state.m:
+            raise BankersError(f"{what} must have {state.m} resource values.")
+        items = enumerate(vec)
+    out = {}
+    for j, v in items:
+        j, v = _resource(j), to_int(v)
+        if not 0 <= j < state.m:
+            raise BankersError(f"{what}: resource R{j} does not exist.")
+        if v < 0:
+            raise BankersError(f"{what} values cannot be negative.")
+        if v:
+            out[j] = v
+    return out
+
+
+def _validate_pid(state, pid):
+    if pid < 0 or pid >= state.n:
+        raise BankersError("Invalid Process ID")
+
+
+def provisional_state(state, pid, req):
+    """Returns the state after moving ``req`` (a sparse dict) from Available to ``pid``.
+
+    Negative amounts release. Only ``pid``'s rows are copied.
+    """
+    alloc = state.allocation[:]
+    need = state.need[:]
+    avail = state.available[:]
+    a_row = dict(alloc[pid])
+    n_row = dict(need[pid])
+    for j, r in req.items():
+        a = a_row.get(j, 0) + r
+        left = n_row.get(j, 0) - r
+        if a:
+            a_row[j] = a
+        else:
+            a_row.pop(j, None)
+        if left:
+            n_row[j] = left
+        else:
+            n_row.pop(j, None)
+        avail[j] -= r
+    alloc[pid] = a_row
+    need[pid] = n_row
+    return SparseState._from_parts(alloc, state.maximum, avail, need)
+
+
+def validate_request(state, pid, req):
+    """Raises :class:`BankersError` unless the sparse ``req`` is a valid request."""
+    _validate_pid(state, pid)
+    need = state.need[pid]
+    if any(r > need.get(j, 0) for j, r in req.items()):
+        raise BankersError("Request exceeds Need")
+
+
+def request(state, pid, req_vec):
+    """Runs the Resource-Request algorithm; see :func:`bankers_engine.request`.
+
+    ``req_vec`` may be a dense vector or a ``{resource: value}`` dict; the
+    cost of everything but the safety check depends only on its non-zeros.
+    """
+    req = _sparse_vector(state, req_vec, "Request")
+    validate_request(state, pid, req)
+    avail = state.available
+    if any(r > avail[j] for j, r in req.items()):
+        return RequestResult(WAIT, None, state)
+
+    new_state = provisional_state(state, pid, req)
+    seq = safe_sequence(new_state)
+    if seq is None:
+        return RequestResult(DENIED, None, state)
+    return RequestResult(GRANTED, seq, new_state)
+
+
+def release(state, pid, rel_vec):
+    """Returns the state after ``pid`` gives back ``rel_vec`` (dense or sparse)."""
+    rel = _sparse_vector(state, rel_vec, "Release")
+    _validate_pid(state, pid)
+    held = state.allocation[pid]
+    if any(r > held.get(j, 0) for j, r in rel.items()):
+        raise BankersError("Release exceeds Allocation")
+    return provisional_state(state, pid, {j: -r for j, r in rel.items()})
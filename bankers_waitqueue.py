@@ -0,0 +1,144 @@
+"""Pending-request queue woken by resource releases.
+
+Each waiting request is indexed under one resource it is blocked on, in a
+heap ordered by how much of that resource it asks for. A release only
+looks at the heaps of the resources that grew and pops just the entries
+that now fit there; an entry still blocked elsewhere moves to that
+resource's heap. Requests that fit everywhere are handed back for
+re-evaluation in the queue's fairness order.
+"""
+import heapq
+import itertools
+
+FIFO = "fifo"
+SMALLEST = "smallest"
+POLICIES = (FIFO, SMALLEST)
+
+
+class Waiter:
+    """A request parked until Available can cover it."""
+
+    __slots__ = ("seq", "pid", "vector", "payload", "size", "queued", "cancelled")
+
+    def __init__(self, seq, pid, vector, payload):
+        self.seq = seq
+        self.pid = pid
+        self.vector = vector
+        self.payload = payload
+        self.size = sum(vector)
+        self.queued = False
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"Waiter(P{self.pid}, {self.vector})"
+
+
+def blocking_resource(vector, available):
+    """Returns the first resource index where ``vector`` exceeds ``available``, or None."""
+    for j, (r, a) in enumerate(zip(vector, available)):
+        if r > a:
+            return j
+    return None
+
+
+class WaitQueue:
+    """Waiting requests indexed by the resource each one is blocked on.
+
+    ``policy`` orders requests that become runnable in the same release:
+    FIFO by arrival, or SMALLEST total request first (ties by arrival).
+    """
+
+    def __init__(self, m, policy=FIFO):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}")
+        self.policy = policy
+        self._index = [[] for _ in range(m)]
+        self._counter = itertools.count()
+        self._live = 0
+
+    def __len__(self):
+        return self._live
+
+    def add(self, pid, vector, available, payload=None):
+        """Parks a request and returns its :class:`Waiter`.
+
+        Returns None if ``vector`` already fits in ``available``, in which
+        case nothing is queued and the caller should evaluate it directly.
+        """
+        vector = list(vector)
+        j = blocking_resource(vector, available)
+        if j is None:
+            return None
+        waiter = Waiter(next(self._counter), pid, vector, payload)
+        self._push(j, waiter)
+        return waiter
+
+    def _push(self, j, waiter):
+        heapq.heappush(self._index[j], (waiter.vector[j], waiter.seq, waiter))
+        waiter.queued = True
+        self._live += 1
+
+    def requeue(self, waiter, available):
+        """Parks ``waiter`` again after it was handed out but still did not fit.
+
+        Returns False, without queueing it, if it fits ``available``.
+        """
+        j = blocking_resource(waiter.vector, available)
+        if j is None or waiter.cancelled:
+            return False
+        self._push(j, waiter)
+        return True
+
+    def cancel(self, waiter):
+        """Removes a waiter; it is dropped lazily from its heap."""
+        waiter.cancelled = True
+        if waiter.queued:
+            waiter.queued = False
+            self._live -= 1
+
+    def on_release(self, released, available):
+        """Returns the waiters that fit ``available`` after a release.
+
+        ``released`` marks the resources whose availability grew (any
+        vector whose non-zero entries are those resources). The returned
+        waiters are removed from the queue, ordered by the fairness policy;
+        ones the caller cannot grant after all go back via :meth:`requeue`.
+        """
+        ready = []
+        for j, grew in enumerate(released):
+            if not grew:
+                continue
+            heap = self._index[j]
+            limit = available[j]
+            while heap and heap[0][0] <= limit:
+                _, _, waiter = heapq.heappop(heap)
+                if waiter.cancelled:
+                    continue
+                k = blocking_resource(waiter.vector, available)
+                if k is None:
+                    waiter.queued = False
+                    self._live -= 1
+                    ready.append(waiter)
+                else:
+                    heapq.heappush(self._index[k], (waiter.vector[k], waiter.seq, waiter))
+
+        if self.policy == SMALLEST:
+            ready.sort(key=lambda w: (w.size, w.seq))
+        else:
+            ready.sort(key=lambda w: w.seq)
+        return ready
+
+    def waiters(self):
+        """Iterates the queued requests, in no particular order."""
+        for heap in self._index:
+            for _, _, waiter in heap:
+                if waiter.queued and not waiter.cancelled:
+                    yield waiter
+
+    def clear(self):
+        """Drops every waiting request."""
+        for heap in self._index:
+            for _, _, waiter in heap:
+                waiter.queued = False
+            heap.clear()
+        self._live = 0
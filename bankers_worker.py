@@ -0,0 +1,128 @@
+"""Runs long Banker's Algorithm jobs off the GUI thread.
+
+A job is a function ``job(progress)`` executed in a daemon thread. It
+reports back only through :attr:`Worker.messages`, a queue the GUI drains
+from its own event loop, so no Tk call ever happens in the worker::
+
+    ("log", [record, ...])        a batch of log records
+    ("progress", done, total)
+    ("done", value)               the job's return value
+    ("error", exception)
+    ("cancelled", None)
+
+Cancellation is cooperative: :meth:`Progress.on_step` can be passed as the
+``on_step`` callback of the safety check and raises :class:`Cancelled`
+once :meth:`Worker.cancel` has been called. An interrupted check leaves the
+allocator unchanged.
+"""
+import queue
+import threading
+
+LOG_BATCH = 500
+
+# Message kinds that end a job
+FINAL = ("done", "error", "cancelled")
+
+
+class Cancelled(Exception):
+    """Raised inside a job when it has been cancelled."""
+
+
+class Progress:
+    """Handed to a job for reporting steps and log lines."""
+
+    def __init__(self, worker, total=0):
+        self.total = total
+        self.done = 0
+        self._worker = worker
+        self._cancel = worker._cancel
+        self._records = []
+        self._every = max(1, total // 100)
+
+    def check(self):
+        """Raises :class:`Cancelled` if the job has been cancelled."""
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def step(self, count=1):
+        """Advances the progress count, posting an update about every 1%."""
+        if self._cancel.is_set():
+            raise Cancelled()
+        before = self.done
+        self.done += count
+        if self.done // self._every != before // self._every:
+            self._worker.messages.put(("progress", self.done, self.total))
+
+    def on_step(self, pid, work_before, work_after):
+        """``on_step`` callback for :func:`bankers_engine.safety_check`."""
+        self.step()
+
+    def log(self, record):
+        """Queues one log record; records are sent to the GUI in batches."""
+        self._records.append(record)
+        if len(self._records) >= LOG_BATCH:
+            self.flush()
+            self.check()
+
+    def flush(self):
+        if self._records:
+            self._worker.messages.put(("log", self._records))
+            self._records = []
+
+
+class Worker:
+    """Runs one job at a time in a background thread."""
+
+    def __init__(self):
+        self.messages = queue.Queue()
+        self._cancel = threading.Event()
+        self._running = False
+
+    @property
+    def busy(self):
+        """True from :meth:`start` until :meth:`poll` returns the job's final message.
+
+        So a new job cannot start, and replace the GUI's callback, while the
+        previous job's result is still waiting in the queue.
+        """
+        return self._running
+
+    def start(self, job, total=0):
+        """Starts ``job(progress)``; raises RuntimeError if a job is still running."""
+        if self.busy:
+            raise RuntimeError("A job is already running.")
+        self._cancel.clear()
+        self._running = True
+        progress = Progress(self, total)
+        threading.Thread(target=self._run, args=(job, progress), daemon=True).start()
+
+    def _run(self, job, progress):
+        try:
+            message = ("done", job(progress))
+        except Cancelled:
+            message = ("cancelled", None)
+        except Exception as exc:
+            message = ("error", exc)
+        progress.flush()
+        self.messages.put(message)
+
+    def cancel(self):
+        """Asks the running job to stop at its next step."""
+        self._cancel.set()
+
+    def poll(self, limit=100):
+        """Returns up to ``limit`` pending messages without blocking.
+
+        The job counts as finished once its final message has been returned.
+        """
+        out = []
+        try:
+            while len(out) < limit:
+                message = self.messages.get_nowait()
+                out.append(message)
+                if message[0] in FINAL:
+                    self._running = False
+                    break
+        except queue.Empty:
+            pass
+        return out
@@ -0,0 +1,136 @@
+"""Random operation sequences on BankersAllocator, checked against the plain engine."""
+import random
+import unittest
+from unittest import mock
+
+from bankers_allocator import BankersAllocator
+from bankers_engine import DENIED, GRANTED, WAIT, BankersState, is_safe
+
+
+def _replay_ok(state, sequence):
+    # True if every process in ``sequence`` fits the Work left by the ones before it
+    work = state.available[:]
+    for p in sequence:
+        if any(x > w for x, w in zip(state.need[p], work)):
+            return False
+        work = [w + a for w, a in zip(work, state.allocation[p])]
+    return True
+
+
+class Reference:
+    """The expected matrices, updated with plain list arithmetic."""
+
+    def __init__(self, allocation, maximum, available):
+        self.allocation = [row[:] for row in allocation]
+        self.maximum = [row[:] for row in maximum]
+        self.available = available[:]
+
+    def state(self):
+        return BankersState(self.allocation, self.maximum, self.available)
+
+    def move(self, pid, vec, sign):
+        for j, v in enumerate(vec):
+            self.allocation[pid][j] += sign * v
+            self.available[j] -= sign * v
+
+
+def random_state(rng, n, m):
+    allocation = [[rng.randint(0, 2) for _ in range(m)] for _ in range(n)]
+    maximum = [[a + rng.randint(0, 3) for a in row] for row in allocation]
+    available = [rng.randint(0, 4) for _ in range(m)]
+    return allocation, maximum, available
+
+
+class AllocatorAgainstEngineTest(unittest.TestCase):
+    def run_sequences(self, cache_size, seed, rounds=150, ops=40):
+        rng = random.Random(seed)
+        for _ in range(rounds):
+            n, m = rng.randint(1, 7), rng.randint(1, 3)
+            allocation, maximum, available = random_state(rng, n, m)
+            allocator = BankersAllocator(BankersState(allocation, maximum, available), cache_size)
+            ref = Reference(allocation, maximum, available)
+            removed = set()
+            for _ in range(ops):
+                self.apply_random_op(rng, allocator, ref, removed)
+                self.assert_matches(allocator, ref)
+
+    def apply_random_op(self, rng, allocator, ref, removed):
+        state = ref.state()
+        live = [p for p in range(state.n) if p not in removed]
+        op = rng.random()
+        if op < 0.45 and live:
+            pid = rng.choice(live)
+            vec = [rng.randint(0, x) for x in state.need[pid]]
+            status = allocator.request(pid, vec).status
+            if any(v > a for v, a in zip(vec, state.available)):
+                expected = WAIT
+            else:
+                after = Reference(ref.allocation, ref.maximum, ref.available)
+                after.move(pid, vec, 1)
+                expected = GRANTED if is_safe(state) and is_safe(after.state()) else DENIED
+            self.assertEqual(status, expected)
+            if status == GRANTED:
+                ref.move(pid, vec, 1)
+        elif op < 0.7 and live:
+            pid = rng.choice(live)
+            vec = [rng.randint(0, a) for a in state.allocation[pid]]
+            allocator.release(pid, vec)
+            ref.move(pid, vec, -1)
+        elif op < 0.8 and live:
+            pid = rng.choice(live)
+            vec = [rng.randint(0, min(x, a)) for x, a in zip(state.need[pid], state.available)]
+            allocator.allocate(pid, vec)
+            ref.move(pid, vec, 1)
+        elif op < 0.88:
+            row = [rng.randint(0, 4) for _ in range(state.m)]
+            pid = allocator.add_process(row)
+            if pid == len(ref.allocation):
+                ref.allocation.append([0] * state.m)
+                ref.maximum.append(row)
+            else:
+                self.assertIn(pid, removed)
+                ref.maximum[pid] = row
+            removed.discard(pid)
+        elif op < 0.94 and live:
+            pid = rng.choice(live)
+            allocator.remove_process(pid)
+            ref.move(pid, ref.allocation[pid][:], -1)
+            ref.maximum[pid] = [0] * state.m
+            removed.add(pid)
+        else:
+            available = [max(0, a + rng.randint(-2, 2)) for a in state.available]
+            allocator.set_available(available)
+            ref.available = available
+
+    def assert_matches(self, allocator, ref):
+        state = ref.state()
+        self.assertEqual(allocator.state.allocation, state.allocation)
+        self.assertEqual(allocator.state.need, state.need)
+        self.assertEqual(allocator.state.available, state.available)
+        result = allocator.check()
+        self.assertEqual(result.safe, is_safe(state))
+        if result.safe:
+            self.assertEqual(sorted(result.sequence), list(range(state.n)))
+        self.assertTrue(_replay_ok(state, result.sequence))
+        # The kept proof must hold the exact Work before every step
+        work = state.available[:]
+        for p, before, after in allocator.steps():
+            self.assertEqual(before, work)
+            work = [w + a for w, a in zip(work, state.allocation[p])]
+            self.assertEqual(after, work)
+
+    def test_without_cache(self):
+        self.run_sequences(cache_size=0, seed=1)
+
+    def test_with_cache(self):
+        self.run_sequences(cache_size=64, seed=2)
+
+    def test_colliding_fingerprints(self):
+        # Every state gets the same key, so each cache hit is a collision to detect
+        with mock.patch("bankers_allocator.cell_hash", return_value=0), \
+                mock.patch("bankers_allocator.state_fingerprint", return_value=0):
+            self.run_sequences(cache_size=64, seed=3, rounds=80)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""DeadlockDetector's incremental updates and victim choice against from-scratch detection."""
+import itertools
+import random
+import unittest
+
+from bankers_detect import DeadlockDetector
+
+
+def naive_deadlocked(allocation, request, available, aborted=()):
+    # Textbook detection: finish any process whose request fits until none does
+    work = available[:]
+    for p in aborted:
+        work = [w + a for w, a in zip(work, allocation[p])]
+    left = [p for p in range(len(allocation)) if p not in set(aborted)]
+    progress = True
+    while progress:
+        progress = False
+        for p in list(left):
+            if all(r <= w for r, w in zip(request[p], work)):
+                work = [w + a for w, a in zip(work, allocation[p])]
+                left.remove(p)
+                progress = True
+    return sorted(left)
+
+
+def random_detector(rng, n, m):
+    allocation = [[rng.randint(0, 2) for _ in range(m)] for _ in range(n)]
+    request = [[rng.randint(0, 3) for _ in range(m)] for _ in range(n)]
+    available = [rng.randint(0, 2) for _ in range(m)]
+    return DeadlockDetector(allocation, request, available)
+
+
+class DetectorEventsTest(unittest.TestCase):
+    def assert_current(self, detector):
+        self.assertEqual(detector.deadlocked,
+                         naive_deadlocked(detector.allocation, detector.request, detector.available))
+        # The kept order must be a valid finish order with the exact Work before each step
+        work = detector.available[:]
+        for k, p in enumerate(detector.order):
+            self.assertEqual(detector._works[k], work)
+            self.assertTrue(all(r <= w for r, w in zip(detector.request[p], work)))
+            work = [w + a for w, a in zip(work, detector.allocation[p])]
+        self.assertEqual(detector._work, work)
+
+    def test_random_events(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            n, m = rng.randint(1, 8), rng.randint(1, 3)
+            detector = random_detector(rng, n, m)
+            self.assert_current(detector)
+            for _ in range(40):
+                pid = rng.randrange(n)
+                op = rng.randrange(5)
+                if op == 0:
+                    detector.add_request(pid, [rng.randint(0, 2) for _ in range(m)])
+                elif op == 1:
+                    detector.withdraw(pid, [rng.randint(0, r) for r in detector.request[pid]])
+                elif op == 2:
+                    detector.grant(pid, [rng.randint(0, min(r, a))
+                                         for r, a in zip(detector.request[pid], detector.available)])
+                elif op == 3:
+                    detector.acquire(pid, [rng.randint(0, a) for a in detector.available])
+                else:
+                    detector.release(pid, [rng.randint(0, a) for a in detector.allocation[pid]])
+                self.assert_current(detector)
+
+
+class VictimsTest(unittest.TestCase):
+    def test_victims_free_everyone_at_minimum_cost(self):
+        rng = random.Random(11)
+        for _ in range(300):
+            n, m = rng.randint(1, 8), rng.randint(1, 3)
+            detector = random_detector(rng, n, m)
+            dead = detector.deadlocked
+            args = (detector.allocation, detector.request, detector.available)
+
+            def price(pids):
+                return sum(1 + sum(detector.allocation[p]) for p in pids)
+
+            best = min(price(c) for r in range(len(dead) + 1) for c in itertools.combinations(dead, r)
+                       if not naive_deadlocked(*args, aborted=c))
+            exact = detector.victims()
+            self.assertTrue(exact.exact)
+            self.assertEqual(naive_deadlocked(*args, aborted=exact.pids), [])
+            self.assertEqual(exact.cost, best)
+            greedy = detector.victims(exact_limit=0)
+            self.assertEqual(naive_deadlocked(*args, aborted=greedy.pids), [])
+            self.assertEqual(greedy.cost, price(greedy.pids))
+            self.assertGreaterEqual(greedy.cost, best)
+
+    def test_on_candidate_can_stop_the_search(self):
+        detector = DeadlockDetector([[1], [1], [1]], [[2], [2], [2]], [0])
+
+        class Stop(Exception):
+            pass
+
+        def stop():
+            raise Stop()
+
+        with self.assertRaises(Stop):
+            detector.victims(on_candidate=stop)
+
+
+if __name__ == "__main__":
+    unittest.main()
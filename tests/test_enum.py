@@ -0,0 +1,83 @@
+"""SafeSequences counts, samples and min-peak search against brute force over permutations."""
+import itertools
+import random
+import unittest
+
+from bankers_engine import BankersError, BankersState
+from bankers_enum import SafeSequences, units_held
+
+
+def valid(state, sequence):
+    work = state.available[:]
+    for p in sequence:
+        if any(x > w for x, w in zip(state.need[p], work)):
+            return False
+        work = [w + a for w, a in zip(work, state.allocation[p])]
+    return True
+
+
+def peak(state, sequence):
+    total = sum(state.available) + sum(sum(row) for row in state.allocation)
+    work = state.available[:]
+    worst = None
+    for p in sequence:
+        cost = units_held(total, state.need[p], work)
+        worst = cost if worst is None else max(worst, cost)
+        work = [w + a for w, a in zip(work, state.allocation[p])]
+    return worst
+
+
+class SafeSequencesTest(unittest.TestCase):
+    def test_against_permutations(self):
+        rng = random.Random(4)
+        for _ in range(300):
+            n, m = rng.randint(0, 6), rng.randint(1, 3)
+            allocation = [[rng.randint(0, 2) for _ in range(m)] for _ in range(n)]
+            if n > 1 and rng.random() < 0.5:
+                allocation[1] = allocation[0][:]
+            maximum = [[a + rng.randint(0, 2) for a in row] for row in allocation]
+            if n > 1 and allocation[1] == allocation[0] and rng.random() < 0.7:
+                maximum[1] = maximum[0][:]
+            state = BankersState(allocation, maximum, [rng.randint(0, 3) for _ in range(m)])
+            space = SafeSequences(state)
+            every = [q for q in itertools.permutations(range(n)) if valid(state, q)]
+            self.assertEqual(space.count, len(every))
+
+            found = list(space.sequences())
+            self.assertEqual(len(found), space.class_count)
+            self.assertEqual(len(set(map(tuple, found))), len(found))
+            self.assertTrue(all(valid(state, q) for q in found))
+            if not every:
+                self.assertIsNone(space.sample())
+                self.assertIsNone(space.min_peak())
+                continue
+            self.assertTrue(valid(state, space.sample(rng)))
+            best, sequence = space.min_peak()
+            self.assertTrue(valid(state, sequence))
+            if n:
+                self.assertEqual(best, peak(state, sequence))
+                self.assertEqual(best, min(peak(state, q) for q in every))
+
+    def test_limits_raise(self):
+        n = 300
+        state = BankersState([[1, 0]] * n, [[1 + i, 1 + i % 5] for i in range(n)], [n, 5])
+        with self.assertRaises(BankersError):
+            SafeSequences(state)
+        with self.assertRaises(BankersError):
+            SafeSequences(state, max_states=10, max_tests=10 ** 9)
+
+    def test_on_state_can_stop_the_search(self):
+        state = BankersState([[0]] * 4, [[1], [2], [3], [4]], [4])
+
+        class Stop(Exception):
+            pass
+
+        def stop():
+            raise Stop()
+
+        with self.assertRaises(Stop):
+            SafeSequences(state, on_state=stop)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""max_grant and headroom against probing every amount."""
+import random
+import unittest
+
+from bankers_allocator import BankersAllocator
+from bankers_engine import BankersState, is_safe, provisional_state
+from bankers_query import headroom, max_grant
+
+
+def largest_safe(state, pid, j):
+    if not is_safe(state):
+        return 0
+    best = 0
+    for x in range(min(state.need[pid][j], state.available[j]) + 1):
+        vec = [0] * state.m
+        vec[j] = x
+        if is_safe(provisional_state(state, pid, vec)):
+            best = x
+    return best
+
+
+class QueryTest(unittest.TestCase):
+    def test_against_probing(self):
+        rng = random.Random(9)
+        for _ in range(200):
+            n, m = rng.randint(1, 6), rng.randint(1, 3)
+            allocation = [[rng.randint(0, 3) for _ in range(m)] for _ in range(n)]
+            maximum = [[a + rng.randint(0, 5) for a in row] for row in allocation]
+            state = BankersState(allocation, maximum, [rng.randint(0, 6) for _ in range(m)])
+            allocator = BankersAllocator(state)
+            expected = {p: [largest_safe(state, p, j) for j in range(m)] for p in range(n)}
+            for p in range(n):
+                for j in range(m):
+                    self.assertEqual(max_grant(state, p, j), expected[p][j])
+                    self.assertEqual(max_grant(allocator, p, j), expected[p][j])
+            self.assertEqual(headroom(allocator, exact=True), expected)
+            bounds = headroom(state)
+            for p in range(n):
+                for j in range(m):
+                    self.assertLessEqual(bounds[p][j], expected[p][j])
+
+
+if __name__ == "__main__":
+    unittest.main()
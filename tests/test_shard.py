@@ -0,0 +1,41 @@
+"""ShardedAllocator quota borrowing, run in-process."""
+import unittest
+
+from bankers_engine import GRANTED, WAIT, BankersError, BankersState
+from bankers_shard import ShardedAllocator
+
+
+def pool():
+    # Shard 0 holds no global units; shard 1 can spare all 5 of its own
+    a = BankersState([[0, 0], [1, 0]], [[3, 4], [2, 0]], [2, 0])
+    b = BankersState([[0, 0]], [[1, 0]], [1, 5])
+    return ShardedAllocator([a, b], globals=1, workers=False)
+
+
+class ShardTest(unittest.TestCase):
+    def test_invalid_request_borrows_nothing(self):
+        with pool() as shards:
+            with self.assertRaises(BankersError):
+                shards.request(0, 0, [0, 9])
+            self.assertEqual(shards.quotas(), [[0], [5]])
+
+    def test_ungranted_request_returns_loans(self):
+        with pool() as shards:
+            self.assertEqual(shards.request(0, 0, [3, 4])[0], WAIT)
+            self.assertEqual(shards.quotas(), [[0], [5]])
+
+    def test_granted_request_keeps_loans(self):
+        with pool() as shards:
+            self.assertEqual(shards.request(0, 0, [1, 4])[0], GRANTED)
+            self.assertEqual(shards.quotas(), [[0], [1]])
+            self.assertTrue(shards.check()[0])
+
+    def test_request_many_later_path(self):
+        with pool() as shards:
+            statuses = shards.request_many([(0, 0, [0, 9]), (0, 0, [3, 4]), (0, 0, [1, 4])])
+            self.assertEqual(statuses, ["error: Request exceeds Need", WAIT, GRANTED])
+            self.assertEqual(shards.quotas(), [[0], [1]])
+
+
+if __name__ == "__main__":
+    unittest.main()